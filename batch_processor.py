@@ -156,7 +156,7 @@ class BatchProcessor:
             
             # STEP 5: Extract details using registry
             self.logger.info(f"📄 Extracting detail data...")
-            detail_df = self.registry.extract_details(filepath, header_data)
+            detail_df = self.registry.extract_details(filepath, header_data, vendor_key=vendor)
             
             if detail_df.empty:
                 error_msg = f"Detail extraction failed for vendor: {vendor}"
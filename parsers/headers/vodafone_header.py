@@ -5,14 +5,62 @@ Routes to appropriate branch header parser based on filename and content
 """
 
 import os
+import functools
 import fitz
 import pandas as pd
 import logging
+from typing import Optional
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Branch parsers are resolved once at import; a missing branch degrades to None.
+# Neither module configures logging at import, so this stays cheap.
+try:
+    from parsers.headers import vodafone_uk_header
+except ImportError as e:
+    logger.error("❌ Failed to import Vodafone UK header parser: %s", e)
+    vodafone_uk_header = None
+
+try:
+    from parsers.headers import vodafone_png_header
+except ImportError:
+    vodafone_png_header = None
+
+# Content-based routing decisions kept for this many recently seen files
+ROUTE_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def _content_route(path: str, size: int, mtime: float) -> Optional[str]:
+    """
+    Branch ('uk', 'png' or None) suggested by the first page of a PDF.
+    Keyed by (path, size, mtime), so re-running the same unchanged file
+    skips opening the PDF just to pick a branch.
+    """
+    # Only page 0 is needed for routing; the context manager releases
+    # the MuPDF document as soon as the text is read
+    with fitz.open(path, filetype='pdf') as doc:
+        first_page_text = doc.load_page(0).get_text('text')
+    
+    # Check for UK-specific patterns
+    if any(pattern in first_page_text for pattern in [
+        'Your registered address:', 
+        'Vodafone Business UK',
+        'United Kingdom',
+        'GBP'
+    ]):
+        return 'uk'
+    
+    # Check for PNG-specific patterns  
+    if any(pattern in first_page_text for pattern in [
+        'Papua New Guinea',
+        'Vodafone Papua New Guinea',
+        'PGK'
+    ]):
+        return 'png'
+    
+    return None
+
 def extract_header(pdf_path: str) -> pd.DataFrame:
     """
     Route to appropriate Vodafone branch header parser
@@ -25,7 +73,7 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
     """
     try:
         filename = os.path.basename(pdf_path).lower()
-        logger.info(f"🔄 Routing Vodafone header parser for: {filename}")
+        logger.info("🔄 Routing Vodafone header parser for: %s", filename)
         
         # Method 1: Filename-based routing (fastest)
         if 'uk' in filename or 'britain' in filename:
@@ -37,68 +85,53 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
         
         # Method 2: Content-based routing (fallback)
         try:
-            doc = fitz.open(pdf_path)
-            first_page_text = doc[0].get_text()
-            doc.close()
+            st = os.stat(pdf_path)
+            branch = _content_route(os.path.abspath(pdf_path), st.st_size, st.st_mtime)
             
-            # Check for UK-specific patterns
-            if any(pattern in first_page_text for pattern in [
-                'Your registered address:', 
-                'Vodafone Business UK',
-                'United Kingdom',
-                'GBP'
-            ]):
+            if branch == 'uk':
                 logger.info("🇬🇧 Routing to Vodafone UK header parser (content)")
                 return route_to_uk_parser(pdf_path)
-            
-            # Check for PNG-specific patterns  
-            elif any(pattern in first_page_text for pattern in [
-                'Papua New Guinea',
-                'Vodafone Papua New Guinea',
-                'PGK'
-            ]):
+            elif branch == 'png':
                 logger.info("🇵🇬 Routing to Vodafone PNG header parser (content)")
                 return route_to_png_parser(pdf_path)
                 
         except Exception as e:
-            logger.warning(f"Content analysis failed: {e}")
+            logger.warning("Content analysis failed: %s", e)
         
         # Method 3: Default fallback to UK (most common)
         logger.info("🔄 Defaulting to Vodafone UK header parser")
         return route_to_uk_parser(pdf_path)
         
     except Exception as e:
-        logger.error(f"❌ Error in Vodafone header routing: {e}")
+        logger.error("❌ Error in Vodafone header routing: %s", e)
         return pd.DataFrame()
 
 def route_to_uk_parser(pdf_path: str) -> pd.DataFrame:
     """Route to Vodafone UK header parser"""
+    if vodafone_uk_header is None:
+        logger.error("❌ Vodafone UK header parser is not available")
+        return pd.DataFrame()
     try:
-        from parsers.headers import vodafone_uk_header
         return vodafone_uk_header.extract_header(pdf_path)
-    except ImportError as e:
-        logger.error(f"❌ Failed to import Vodafone UK header parser: {e}")
-        return pd.DataFrame()
     except Exception as e:
-        logger.error(f"❌ Error in Vodafone UK header parser: {e}")
+        logger.error("❌ Error in Vodafone UK header parser: %s", e)
         return pd.DataFrame()
 
 def route_to_png_parser(pdf_path: str) -> pd.DataFrame:
     """Route to Vodafone PNG header parser"""
-    try:
-        # NOTE: Placeholder for PNG parser - to be implemented
-        from parsers.headers import vodafone_png_header
-        return vodafone_png_header.extract_header(pdf_path)
-    except ImportError:
+    if vodafone_png_header is None:
         logger.warning("⚠️ Vodafone PNG header parser not yet implemented - falling back to UK parser")
         return route_to_uk_parser(pdf_path)
+    try:
+        return vodafone_png_header.extract_header(pdf_path)
     except Exception as e:
-        logger.error(f"❌ Error in Vodafone PNG header parser: {e}")
+        logger.error("❌ Error in Vodafone PNG header parser: %s", e)
         logger.info("🔄 Falling back to UK parser")
         return route_to_uk_parser(pdf_path)
 
 # For testing
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     print("🧪 Testing Vodafone Header Router")
     print("=" * 50)
     
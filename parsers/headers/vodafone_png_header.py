@@ -2,61 +2,238 @@
 """
 Vodafone Papua New Guinea Header Parser
 Extracts invoice metadata from first page of Vodafone PNG invoices
+
+Don't run this parser directly. Use a test module from the project root:
+    python test_png_parser.py
+
+Or integrate with your batch processor:
+    from parsers.headers.vodafone_png_header import extract_header
+    header_df = extract_header('path/to/invoice.pdf')
 """
 
 import fitz  # PyMuPDF
 import re
-import pandas as pd
 from datetime import datetime
 import logging
 import os
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+# pandas is imported where DataFrames are built, so text-only callers skip its import cost;
+# type checkers still see it for the "pd.DataFrame" annotations
+if TYPE_CHECKING:
+    import pandas as pd
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_vendor_name_png(pdf_path: str) -> str:
+# The Snowflake config lives at the project root; without it only catalog lookups fail.
+try:
+    from config.snowflake_config import get_snowflake_session as _get_session
+except ImportError:
+    _get_session = None
+
+# One Snowpark session per thread, created on the first catalog cache miss. The app's
+# Flask server handles requests on threads; the pid check stops batch workers from
+# reusing a connection forked from the parent.
+_SESSION = threading.local()
+
+def _snowflake_session():
+    """Return this thread's Snowflake session, raising ImportError when config/ is not importable"""
+    if _get_session is None:
+        raise ImportError("config.snowflake_config is not available")
+    cached = getattr(_SESSION, 'session', None)
+    if cached is None or cached[0] != os.getpid():
+        cached = _SESSION.session = (os.getpid(), _get_session())
+    return cached[1]
+
+# Invoice field patterns, compiled once at import
+
+VENDOR_RE = re.compile(r"(Vodafone PNG Ltd)\s+TIN:", re.IGNORECASE)
+VENDOR_FALLBACK_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"(Vodafone PNG [^,\n]*)",
+    r"(Vodafone [^,\n]*PNG[^,\n]*)",
+    r"(VODAFONE PNG[^,\n]*)"
+))
+INVOICE_ID_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Invoice Number[:\s]+([A-Z0-9\-]+)",
+    r"Invoice ID[:\s]+([A-Z0-9\-]+)",
+    r"Invoice No[:\s]+([A-Z0-9\-]+)",
+    r"Bill Number[:\s]+([A-Z0-9\-]+)",
+    r"Document Number[:\s]+([A-Z0-9\-]+)"
+))
+INVOICE_ID_LINE_RE = re.compile(r'^[A-Z0-9\-]{3,}$')
+ISSUE_DATE_RE = re.compile(r"Issue Date[:\s]+(\d{1,2}-\w{3}-\d{2})", re.IGNORECASE)
+FALLBACK_DATE_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Invoice Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+    r"Bill Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+    r"Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
+    r"(\d{1,2}\s+\w+\s+\d{4})",  # DD Month YYYY format
+))
+# Shapes of the fallback dates, used to pick the one strptime format that can parse them
+NUMERIC_DATE_RE = re.compile(r'^\d{1,2}([/-])\d{1,2}\1(\d{4}|\d{2})$')
+TEXT_DATE_RE = re.compile(r'^\d{1,2}\s+([A-Za-z]+)\s+\d{4}$')
+BAN_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Account Number[:\s]+([A-Z0-9\-]+)",
+    r"Customer Number[:\s]+([A-Z0-9\-]+)",
+    r"Account ID[:\s]+([A-Z0-9\-]+)",
+    r"Customer ID[:\s]+([A-Z0-9\-]+)",
+    r"BAN[:\s]+([A-Z0-9\-]+)"
+))
+# Company-name line: a case-sensitive company indicator, none of the vendor/skip
+# words (any case), and longer than 10 characters
+ENTITY_LINE_RE = re.compile(
+    r'^(?!.*(?i:vodafone|invoice|bill|total|amount|page))'
+    r'(?=.*(?:Limited|Ltd|Inc|Corp|Communications))'
+    r'.{11,}$'
+)
+ENTITY_FALLBACK_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Bill To[:\s]*\n\s*([^\n]+)",
+    r"Customer Name[:\s]+([^\n]+)",
+    r"Account Holder[:\s]+([^\n]+)",
+    r"Company Name[:\s]+([^\n]+)"
+))
+TOTAL_CURRENT_CHARGES_RE = re.compile(r"Total Current Charges \(K\)\s+([\d,]+\.?\d*)", re.IGNORECASE)
+TOTAL_DUE_RE = re.compile(r"Total Due \(K\)[:\s]+([\d,]+\.?\d*)", re.IGNORECASE)
+TOTAL_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Total Amount[:\s]*\(K\)\s*([\d,]+\.?\d*)",           # With (K) indicator
+    r"Amount Due[:\s]*\(K\)\s*([\d,]+\.?\d*)",             # With (K) indicator
+    r"Invoice Total[:\s]*\(K\)\s*([\d,]+\.?\d*)",          # With (K) indicator
+    r"Balance Due[:\s]*\(K\)\s*([\d,]+\.?\d*)",            # With (K) indicator
+    r"Final Amount[:\s]*\(K\)\s*([\d,]+\.?\d*)",           # With (K) indicator
+    # Plain patterns without currency indicator
+    r"Total Amount[:\s]+([\d,]+\.?\d*)",
+    r"Amount Due[:\s]+([\d,]+\.?\d*)",
+    r"Total Due[:\s]+([\d,]+\.?\d*)",
+    r"Invoice Total[:\s]+([\d,]+\.?\d*)"
+))
+NUMBER_RE = re.compile(r'([\d,]+\.?\d*)')
+AMOUNT_RE = re.compile(r'([\d,]+\.\d{2})')
+WS_RE = re.compile(r'\s+')
+
+# Keyword tuples for the line-by-line fallbacks (compared against lowercased lines
+# unless noted otherwise)
+INVOICE_ID_KEYWORDS = ('invoice number', 'invoice id', 'invoice no')
+ENTITY_HINT_WORDS = ('Speedcast', 'Limited', 'Communications', 'Systems', 'Networks')  # case-sensitive
+ENTITY_SKIP_WORDS = ('vodafone', 'invoice', 'total', 'amount', 'tax')
+
+# Punctuation folding shared by the name normalizers: drop ',' and '.', '-' → ' '
+_PUNCT_TBL = str.maketrans({',': None, '.': None, '-': ' '})
+
+# Trailing legal-form suffixes dropped for vendor matching ("VODAFONE PNG LIMITED LTD" → "VODAFONE PNG")
+_SUFFIX_RE = re.compile(r'(?:\s+(?:LTD|LIMITED|INC|INCORPORATED|CORP|CORPORATION))+$')
+
+# Common business suffixes ignored when comparing core company names
+_SUFFIXES = frozenset({
+    'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'LLC', 'LTD', 'LIMITED',
+    'CO', 'COMPANY', 'LP', 'LLP', 'PLLC', 'PC', 'ENTERPRISES', 'HOLDINGS',
+    'GROUP', 'INTERNATIONAL', 'INTL', 'TECHNOLOGIES', 'TECH', 'SYSTEMS',
+    'SOLUTIONS', 'SERVICES', 'COMMUNICATIONS', 'COMM', 'TELECOM'
+})
+
+# Catalog tables change rarely; cached lookups are refreshed every TTL window
+CATALOG_CACHE_TTL_SECONDS = 300
+
+def _ttl_bucket() -> int:
+    """Current cache window; changes every CATALOG_CACHE_TTL_SECONDS"""
+    return int(time.monotonic() // CATALOG_CACHE_TTL_SECONDS)
+
+@functools.lru_cache(maxsize=1)
+def _active_entities(ttl_bucket: int) -> tuple:
+    """
+    Active ENTITY_CATALOG rows, fetched and tokenized once per TTL window:
+    (rows as (entity_id, entity_name, cleaned_name, word_mask, word_count),
+     first row by cleaned name, word -> bit position in the word masks)
+    """
+    session = _snowflake_session()
+    
+    query = """
+        SELECT ENTITY_ID, ENTITY_NAME
+        FROM ENTITY_CATALOG
+        WHERE STATUS = 'Active'
+        ORDER BY ENTITY_NAME
+    """
+    
+    rows = []
+    by_clean = {}
+    vocab = {}
+    for row in session.sql(query).collect():
+        clean_name = clean_entity_name_for_matching(row[1])
+        # Each snapshot numbers its own words, so a word set is a single int mask
+        mask = 0
+        for token in clean_name.split():
+            mask |= 1 << vocab.setdefault(token, len(vocab))
+        entity = (row[0], row[1], clean_name, mask, mask.bit_count())
+        # setdefault keeps the first row in ENTITY_NAME order
+        by_clean.setdefault(clean_name, entity)
+        rows.append(entity)
+    return tuple(rows), by_clean, vocab
+
+@functools.lru_cache(maxsize=1)
+def _vendor_lookup(ttl_bucket: int) -> tuple:
+    """
+    Active VENDOR_CATALOG names indexed once per TTL window:
+    (by uppercased name, by normalized name, all names in catalog order)
+    """
+    session = _snowflake_session()
+    
+    query = """
+        SELECT VENDOR_NAME
+        FROM VENDOR_CATALOG
+        WHERE STATUS = 'Active'
+        ORDER BY VENDOR_NAME
+    """
+    
+    names = tuple(row[0] for row in session.sql(query).collect())
+    by_upper = {}
+    by_normalized = {}
+    for name in names:
+        # setdefault keeps the first catalog row, as the old linear scan did
+        by_upper.setdefault(name.upper(), name)
+        by_normalized.setdefault(normalize_vendor_name_for_matching(name), name)
+    return by_upper, by_normalized, names
+
+def _first_page_text(pdf_path: str) -> str:
+    """Open the PDF once and return the plain text of its first page"""
+    # Only page 0 is loaded, and the "text" flavour skips block/word layout
+    with fitz.open(pdf_path, filetype='pdf') as doc:
+        return doc.load_page(0).get_text("text")
+
+def extract_vendor_name_png_from_text(first_page_text: str) -> str:
     """
     Extract vendor name from PNG invoice (what's actually printed on invoice)
     Based on PNG format showing "Vodafone PNG Ltd TIN: 501168358"
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG vendor name...")
         
         # PRIMARY PATTERN: "Vodafone PNG Ltd TIN: 501168358" format
-        vendor_pattern = r"(Vodafone PNG Ltd)\s+TIN:"
-        match = re.search(vendor_pattern, first_page_text, re.IGNORECASE)
+        match = VENDOR_RE.search(first_page_text)
         
         if match:
             vendor_name = match.group(1).strip()
-            logger.info(f"✅ Found PNG vendor name: {vendor_name}")
+            logger.info("✅ Found PNG vendor name: %s", vendor_name)
             return vendor_name
         
         # FALLBACK PATTERNS: Other possible vendor formats
-        fallback_patterns = [
-            r"(Vodafone PNG [^,\n]*)",
-            r"(Vodafone [^,\n]*PNG[^,\n]*)",
-            r"(VODAFONE PNG[^,\n]*)"
-        ]
-        
-        for pattern in fallback_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in VENDOR_FALLBACK_RES:
+            match = pattern.search(first_page_text)
             if match:
                 vendor_name = match.group(1).strip()
-                logger.info(f"✅ Found PNG vendor name (fallback): {vendor_name}")
+                logger.info("✅ Found PNG vendor name (fallback): %s", vendor_name)
                 return vendor_name
         
         logger.warning("❌ PNG vendor name not found - using generic")
         return "Vodafone PNG"
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG vendor name: {e}")
+        logger.error("❌ Error extracting PNG vendor name: %s", e)
         return "Vodafone PNG"
 
+@functools.lru_cache(maxsize=4096)
 def normalize_vendor_name_for_matching(name: str) -> str:
     """
     Normalize vendor name for matching
@@ -65,23 +242,14 @@ def normalize_vendor_name_for_matching(name: str) -> str:
     if not name:
         return ""
     
-    # Convert to uppercase and clean
-    cleaned = name.upper().strip()
-    
-    # Remove common punctuation
-    cleaned = cleaned.replace(',', '').replace('.', '').replace('-', ' ')
+    # Convert to uppercase and remove common punctuation in one pass
+    cleaned = name.upper().strip().translate(_PUNCT_TBL)
     
     # Remove business suffixes for vendor matching
-    suffixes_to_remove = [' LTD', ' LIMITED', ' INC', ' INCORPORATED', ' CORP', ' CORPORATION']
-    for suffix in suffixes_to_remove:
-        if cleaned.endswith(suffix):
-            cleaned = cleaned.replace(suffix, '').strip()
+    cleaned = _SUFFIX_RE.sub('', cleaned)
     
-    # Normalize spaces
-    import re
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    return cleaned.strip()
+    # Normalize spaces (split/join collapses the same whitespace as \s+ and trims the ends)
+    return ' '.join(cleaned.split())
 
 def get_catalog_vendor_name(extracted_vendor_name: str) -> str:
     """
@@ -89,57 +257,46 @@ def get_catalog_vendor_name(extracted_vendor_name: str) -> str:
     Handles: "Vodafone PNG Ltd" (invoice) → "VODAFONE PNG" (catalog)
     """
     try:
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
-        logger.info(f"   🔍 Looking up vendor: '{extracted_vendor_name}' in catalog...")
-        
-        # Get all active vendors from catalog
-        query = """
-            SELECT VENDOR_NAME
-            FROM VENDOR_CATALOG
-            WHERE STATUS = 'Active'
-            ORDER BY VENDOR_NAME
-        """
+        logger.info("   🔍 Looking up vendor: '%s' in catalog...", extracted_vendor_name)
         
-        result = session.sql(query).collect()
-        if not result:
+        # Catalog names are indexed once per TTL window; each strategy is a dict hit
+        by_upper, by_normalized, catalog_names = _vendor_lookup(_ttl_bucket())
+        if not catalog_names:
             logger.warning("   ⚠️ No active vendors found in catalog")
             return extracted_vendor_name
         
-        # Try different matching strategies
-        for row in result:
-            catalog_vendor_name = row[0]
-            
-            # Strategy 1: Exact match
-            if extracted_vendor_name.upper() == catalog_vendor_name.upper():
-                logger.info(f"   ✅ Exact vendor match: '{extracted_vendor_name}' → '{catalog_vendor_name}'")
-                return catalog_vendor_name
-            
-            # Strategy 2: PNG-specific matching
-            # "Vodafone PNG Ltd" should match "VODAFONE PNG"
-            extracted_normalized = normalize_vendor_name_for_matching(extracted_vendor_name)
-            catalog_normalized = normalize_vendor_name_for_matching(catalog_vendor_name)
-            
-            if extracted_normalized == catalog_normalized:
-                logger.info(f"   ✅ Normalized vendor match: '{extracted_vendor_name}' → '{catalog_vendor_name}'")
-                logger.info(f"       Normalized: '{extracted_normalized}' = '{catalog_normalized}'")
-                return catalog_vendor_name
-            
-            # Strategy 3: Partial matching for Vodafone variants
-            if ('vodafone' in extracted_vendor_name.lower() and 'vodafone' in catalog_vendor_name.lower() and
-                'png' in extracted_vendor_name.lower() and 'png' in catalog_vendor_name.lower()):
-                logger.info(f"   ✅ Vodafone PNG partial match: '{extracted_vendor_name}' → '{catalog_vendor_name}'")
-                return catalog_vendor_name
-        
-        logger.warning(f"   ⚠️ No vendor match found for '{extracted_vendor_name}' in catalog")
+        # Strategy 1: Exact match
+        catalog_vendor_name = by_upper.get(extracted_vendor_name.upper())
+        if catalog_vendor_name:
+            logger.info("   ✅ Exact vendor match: '%s' → '%s'", extracted_vendor_name, catalog_vendor_name)
+            return catalog_vendor_name
+        
+        # Strategy 2: PNG-specific matching
+        # "Vodafone PNG Ltd" should match "VODAFONE PNG"
+        extracted_normalized = normalize_vendor_name_for_matching(extracted_vendor_name)
+        catalog_vendor_name = by_normalized.get(extracted_normalized)
+        if catalog_vendor_name:
+            logger.info("   ✅ Normalized vendor match: '%s' → '%s'", extracted_vendor_name, catalog_vendor_name)
+            logger.info("       Normalized: '%s'", extracted_normalized)
+            return catalog_vendor_name
+        
+        # Strategy 3: Partial matching for Vodafone variants (scan only when the dicts miss)
+        extracted_lower = extracted_vendor_name.lower()
+        if 'vodafone' in extracted_lower and 'png' in extracted_lower:
+            for catalog_vendor_name in catalog_names:
+                catalog_lower = catalog_vendor_name.lower()
+                if 'vodafone' in catalog_lower and 'png' in catalog_lower:
+                    logger.info("   ✅ Vodafone PNG partial match: '%s' → '%s'", extracted_vendor_name, catalog_vendor_name)
+                    return catalog_vendor_name
+        
+        logger.warning("   ⚠️ No vendor match found for '%s' in catalog", extracted_vendor_name)
         return extracted_vendor_name
         
     except Exception as e:
-        logger.error(f"   ❌ Error looking up vendor in catalog: {e}")
+        logger.error("   ❌ Error looking up vendor in catalog: %s", e)
         return extracted_vendor_name
 
-def extract_header(pdf_path: str) -> pd.DataFrame:
+def extract_header(pdf_path: str) -> "pd.DataFrame":
     """
     Extract header information from Vodafone PNG invoice
     
@@ -149,15 +306,37 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
     Returns:
         DataFrame with header information in standard format
     """
+    import pandas as pd
+    
+    header_data = extract_header_dict(pdf_path)
+    if not header_data:
+        return pd.DataFrame()
+    return pd.DataFrame([header_data])
+
+def extract_header_dict(pdf_path: str) -> dict:
+    """
+    Extract header information from Vodafone PNG invoice as a plain record
+    
+    Batch callers should collect these dicts and build one DataFrame at the end
+    instead of creating a single-row DataFrame per invoice.
+    
+    Args:
+        pdf_path: Path to Vodafone PNG PDF invoice
+        
+    Returns:
+        Header record in standard format, or an empty dict on failure
+    """
     try:
-        logger.info(f"🔄 Extracting Vodafone PNG header from: {os.path.basename(pdf_path)}")
+        logger.info("🔄 Extracting Vodafone PNG header from: %s", os.path.basename(pdf_path))
+        
+        # Open the PDF once and extract every field from the same first-page text
+        first_page_text = _first_page_text(pdf_path)
         
-        # Extract individual components from first page
-        invoice_id = extract_invoice_id_png(pdf_path)
-        invoice_date = extract_invoice_date_png(pdf_path)
-        ban = extract_ban_png(pdf_path)
-        entity_name = extract_entity_name_png(pdf_path)
-        invoice_total = extract_invoice_total_png(pdf_path)
+        invoice_id = extract_invoice_id_png_from_text(first_page_text)
+        invoice_date = extract_invoice_date_png_from_text(first_page_text)
+        ban = extract_ban_png_from_text(first_page_text)
+        entity_name = extract_entity_name_png_from_text(first_page_text)
+        invoice_total = extract_invoice_total_png_from_text(first_page_text)
         
         # Basic validation with PNG-specific fallbacks
         if not invoice_id:
@@ -177,12 +356,12 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
             entity_name = "UNKNOWN"
         
         # Extract vendor name from invoice (what's actually on the invoice)
-        extracted_vendor_name = extract_vendor_name_png(pdf_path)
+        extracted_vendor_name = extract_vendor_name_png_from_text(first_page_text)
         
         # Get the catalog vendor name through lookup (no hardcoding)
         vendor_name = get_catalog_vendor_name(extracted_vendor_name)
         
-        logger.info(f"🏷️ Extracted vendor: '{extracted_vendor_name}' → Catalog vendor: '{vendor_name}'")
+        logger.info("🏷️ Extracted vendor: '%s' → Catalog vendor: '%s'", extracted_vendor_name, vendor_name)
         
         # Get entity ID from catalog using extracted entity name
         entity_id = get_entity_id_from_catalog(entity_name)
@@ -193,13 +372,13 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
         
         # IMPORTANT: Use same logic as UK parser - no hardcoded fallbacks
         if not entity_id:
-            logger.warning(f"⚠️ Entity lookup failed for '{entity_name}'")
+            logger.warning("⚠️ Entity lookup failed for '%s'", entity_name)
         
         if not vendor_code:
-            logger.warning(f"⚠️ Vendor code lookup failed for Entity {entity_id} + {vendor_name}")
+            logger.warning("⚠️ Vendor code lookup failed for Entity %s + %s", entity_id, vendor_name)
         
         if not currency:
-            logger.warning(f"⚠️ Currency lookup failed for vendor '{vendor_name}' - using default PGK")
+            logger.warning("⚠️ Currency lookup failed for vendor '%s' - using default PGK", vendor_name)
             currency = 'PGK'  # Reasonable default for PNG
         
         # Create header record in standard format
@@ -221,84 +400,108 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
             'created_at': datetime.now()
         }
         
-        logger.info(f"✅ Vodafone PNG header extracted successfully")
-        logger.info(f"   Invoice ID: {header_data['invoice_id']}")
-        logger.info(f"   Vendor: {header_data['vendor']} (using catalog name)")
-        logger.info(f"   Entity Extracted: {header_data['entity_name_extracted']} (from invoice)")
-        logger.info(f"   Entity ID: {header_data['invoiced_bu']}")
-        logger.info(f"   Vendor Code: {header_data['vendorno']}")
-        logger.info(f"   Currency: {header_data['currency']}")
-        logger.info(f"   BAN: {header_data['ban']}")
-        logger.info(f"   Date: {header_data['billing_period']}")
-        logger.info(f"   Total: {header_data['currency']} {header_data['invoice_total']:,.2f}")
+        logger.info("✅ Vodafone PNG header extracted successfully")
+        logger.info("   Invoice ID: %s", header_data['invoice_id'])
+        logger.info("   Vendor: %s (using catalog name)", header_data['vendor'])
+        logger.info("   Entity Extracted: %s (from invoice)", header_data['entity_name_extracted'])
+        logger.info("   Entity ID: %s", header_data['invoiced_bu'])
+        logger.info("   Vendor Code: %s", header_data['vendorno'])
+        logger.info("   Currency: %s", header_data['currency'])
+        logger.info("   BAN: %s", header_data['ban'])
+        logger.info("   Date: %s", header_data['billing_period'])
+        logger.info("   Total: %s %s", header_data['currency'], format(header_data['invoice_total'], ',.2f'))
         
-        return pd.DataFrame([header_data])
+        return header_data
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone PNG header: {e}")
+        logger.error("❌ Error extracting Vodafone PNG header: %s", e)
+        return {}
+
+def _warm_catalog_cache():
+    """Process-pool initializer: load the entity catalog once per worker"""
+    try:
+        _active_entities(_ttl_bucket())
+    except Exception as e:
+        logger.warning("⚠️ Could not pre-load PNG entity catalog in worker: %s", e)
+
+def extract_headers_batch(pdf_paths: list, max_workers: int = None) -> "pd.DataFrame":
+    """
+    Extract headers from many Vodafone PNG invoices using worker processes
+    
+    MuPDF serialises work inside one process, so invoices are spread across
+    processes; each worker warms its own catalog cache once at start-up.
+    
+    Args:
+        pdf_paths: Paths to Vodafone PNG PDF invoices
+        max_workers: Worker process count (defaults to os.cpu_count())
+        
+    Returns:
+        DataFrame with one header row per successfully parsed invoice, in input order
+    """
+    import pandas as pd
+    
+    if not pdf_paths:
+        return pd.DataFrame()
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(pdf_paths))
+    if workers <= 1:
+        records = [extract_header_dict(pdf_path) for pdf_path in pdf_paths]
+    else:
+        logger.info("🔄 Extracting %s Vodafone PNG headers with %s workers", len(pdf_paths), workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_catalog_cache) as pool:
+            records = list(pool.map(extract_header_dict, pdf_paths))
+    
+    # Build the DataFrame once from all records rather than concatenating per-invoice frames
+    records = [record for record in records if record]
+    if not records:
         return pd.DataFrame()
+    return pd.DataFrame.from_records(records)
 
-def extract_invoice_id_png(pdf_path: str) -> str:
+def extract_invoice_id_png_from_text(first_page_text: str) -> str:
     """
     Extract invoice ID from Vodafone PNG invoice
     TODO: Update patterns based on actual PNG invoice format
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG invoice ID patterns...")
         
         # PNG-specific patterns (to be updated based on actual format)
-        patterns = [
-            r"Invoice Number[:\s]+([A-Z0-9\-]+)",
-            r"Invoice ID[:\s]+([A-Z0-9\-]+)",
-            r"Invoice No[:\s]+([A-Z0-9\-]+)",
-            r"Bill Number[:\s]+([A-Z0-9\-]+)",
-            r"Document Number[:\s]+([A-Z0-9\-]+)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in INVOICE_ID_RES:
+            match = pattern.search(first_page_text)
             if match:
                 invoice_id = match.group(1).strip()
-                logger.info(f"✅ Found PNG invoice ID: {invoice_id}")
+                logger.info("✅ Found PNG invoice ID: %s", invoice_id)
                 return invoice_id
         
         # Fallback: Look for line-by-line pattern
         lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
         
         for idx, line in enumerate(lines):
-            if any(keyword in line.lower() for keyword in ['invoice number', 'invoice id', 'invoice no']):
+            line_lower = line.lower()
+            if any(keyword in line_lower for keyword in INVOICE_ID_KEYWORDS):
                 if idx + 1 < len(lines):
                     potential_id = lines[idx + 1].strip()
-                    if re.match(r'^[A-Z0-9\-]{3,}$', potential_id):
-                        logger.info(f"✅ Found PNG invoice ID (fallback): {potential_id}")
+                    if INVOICE_ID_LINE_RE.match(potential_id):
+                        logger.info("✅ Found PNG invoice ID (fallback): %s", potential_id)
                         return potential_id
         
         logger.warning("❌ PNG Invoice ID not found")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG invoice ID: {e}")
+        logger.error("❌ Error extracting PNG invoice ID: %s", e)
         return None
 
-def extract_invoice_date_png(pdf_path: str) -> str:
+def extract_invoice_date_png_from_text(first_page_text: str) -> str:
     """
     Extract invoice date from Vodafone PNG invoice
     UPDATED: Based on actual PNG format "Issue Date: 01-Jul-25"
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG invoice date patterns...")
         
         # PRIMARY PATTERN: PNG-specific "Issue Date: 01-Jul-25" format
-        issue_date_pattern = r"Issue Date[:\s]+(\d{1,2}-\w{3}-\d{2})"
-        match = re.search(issue_date_pattern, first_page_text, re.IGNORECASE)
+        match = ISSUE_DATE_RE.search(first_page_text)
         
         if match:
             date_str = match.group(1).strip()
@@ -306,222 +509,183 @@ def extract_invoice_date_png(pdf_path: str) -> str:
                 # Parse "01-Jul-25" format
                 parsed_date = datetime.strptime(date_str, "%d-%b-%y")
                 formatted_date = parsed_date.strftime("%Y-%m-%d")
-                logger.info(f"✅ Found PNG issue date: {date_str} → {formatted_date}")
+                logger.info("✅ Found PNG issue date: %s → %s", date_str, formatted_date)
                 return formatted_date
             except ValueError as e:
-                logger.warning(f"⚠️ Could not parse PNG issue date format: {date_str} ({e})")
+                logger.warning("⚠️ Could not parse PNG issue date format: %s (%s)", date_str, e)
                 return date_str
         
         # FALLBACK PATTERNS: Other possible date formats
-        fallback_patterns = [
-            r"Invoice Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
-            r"Bill Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
-            r"Date[:\s]+(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})",
-            r"(\d{1,2}\s+\w+\s+\d{4})",  # DD Month YYYY format
-        ]
-        
-        for pattern in fallback_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in FALLBACK_DATE_RES:
+            match = pattern.search(first_page_text)
             if match:
                 date_str = match.group(1).strip()
-                try:
-                    # Try different date formats
-                    for fmt in ["%d/%m/%Y", "%d-%m-%Y", "%d/%m/%y", "%d-%m-%y", "%d %B %Y", "%d %b %Y"]:
-                        try:
-                            parsed_date = datetime.strptime(date_str, fmt)
-                            formatted_date = parsed_date.strftime("%Y-%m-%d")
-                            logger.info(f"✅ Found PNG date (fallback): {date_str} → {formatted_date}")
-                            return formatted_date
-                        except ValueError:
-                            continue
-                    
-                    # If parsing fails, return as-is
-                    logger.warning(f"⚠️ Could not parse PNG date format: {date_str}")
-                    return date_str
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Error parsing PNG date: {e}")
-                    return date_str
+                formatted_date = _parse_fallback_date(date_str)
+                if formatted_date:
+                    logger.info("✅ Found PNG date (fallback): %s → %s", date_str, formatted_date)
+                    return formatted_date
+                
+                # If parsing fails, return as-is
+                logger.warning("⚠️ Could not parse PNG date format: %s", date_str)
+                return date_str
         
         logger.warning("❌ PNG Invoice date not found")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG invoice date: {e}")
+        logger.error("❌ Error extracting PNG invoice date: %s", e)
         return None
 
-def extract_ban_png(pdf_path: str) -> str:
+def _parse_fallback_date(date_str: str) -> str:
+    """
+    Parse a fallback date ("01/07/2025", "01-07-25", "1 July 2025", "1 Jul 2025")
+    with the single strptime format its shape implies; None if it cannot be parsed
+    """
+    shape = NUMERIC_DATE_RE.match(date_str)
+    if shape:
+        separator, year = shape.groups()
+        fmt = f"%d{separator}%m{separator}{'%Y' if len(year) == 4 else '%y'}"
+    else:
+        shape = TEXT_DATE_RE.match(date_str)
+        if not shape:
+            return None
+        fmt = "%d %B %Y" if len(shape.group(1)) > 3 else "%d %b %Y"
+    
+    try:
+        return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+def extract_ban_png_from_text(first_page_text: str) -> str:
     """
     Extract account number (BAN) from Vodafone PNG invoice
     TODO: Update patterns based on actual PNG format
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG account number patterns...")
         
         # PNG-specific BAN patterns (to be updated)
-        patterns = [
-            r"Account Number[:\s]+([A-Z0-9\-]+)",
-            r"Customer Number[:\s]+([A-Z0-9\-]+)",
-            r"Account ID[:\s]+([A-Z0-9\-]+)",
-            r"Customer ID[:\s]+([A-Z0-9\-]+)",
-            r"BAN[:\s]+([A-Z0-9\-]+)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in BAN_RES:
+            match = pattern.search(first_page_text)
             if match:
                 ban = match.group(1).strip()
-                logger.info(f"✅ Found PNG BAN: {ban}")
+                logger.info("✅ Found PNG BAN: %s", ban)
                 return ban
         
         logger.warning("❌ PNG BAN not found")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG BAN: {e}")
+        logger.error("❌ Error extracting PNG BAN: %s", e)
         return None
 
-def extract_entity_name_png(pdf_path: str) -> str:
+def extract_entity_name_png_from_text(first_page_text: str) -> str:
     """
     Extract entity/customer name from Vodafone PNG invoice
     UPDATED: Based on actual PNG format showing "Speedcast PNG Limited"
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG entity name patterns...")
         
         # PRIMARY PATTERN: Look for company names with "Limited" or similar
         # Based on screenshot showing "Speedcast PNG Limited"
         lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
         
-        for i, line in enumerate(lines):
-            # Look for lines with company indicators
-            if any(indicator in line for indicator in ['Limited', 'Ltd', 'Inc', 'Corp', 'Communications']):
-                # Skip lines that contain Vodafone (vendor info)
-                if 'vodafone' not in line.lower() and len(line) > 10:
-                    # Additional validation: should be a reasonable company name
-                    if not any(skip in line.lower() for skip in ['invoice', 'bill', 'total', 'amount', 'page']):
-                        logger.info(f"✅ Found PNG entity name: {line}")
-                        return line
+        for line in lines:
+            # Company indicator present, no Vodafone (vendor info) or invoice/total wording
+            if ENTITY_LINE_RE.match(line):
+                logger.info("✅ Found PNG entity name: %s", line)
+                return line
         
         # FALLBACK PATTERNS: Traditional bill-to patterns
-        fallback_patterns = [
-            r"Bill To[:\s]*\n\s*([^\n]+)",
-            r"Customer Name[:\s]+([^\n]+)",
-            r"Account Holder[:\s]+([^\n]+)",
-            r"Company Name[:\s]+([^\n]+)"
-        ]
-        
-        for pattern in fallback_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in ENTITY_FALLBACK_RES:
+            match = pattern.search(first_page_text)
             if match:
                 entity_name = match.group(1).strip()
                 # Clean up the entity name
-                entity_name = re.sub(r'\s+', ' ', entity_name)  # Normalize spaces
+                entity_name = WS_RE.sub(' ', entity_name)  # Normalize spaces
                 if len(entity_name) > 3:  # Reasonable length check
-                    logger.info(f"✅ Found PNG entity name (fallback): {entity_name}")
+                    logger.info("✅ Found PNG entity name (fallback): %s", entity_name)
                     return entity_name
         
         # ADVANCED FALLBACK: Look in specific area after customer info
         # Skip first few lines (header) and look in customer details area
-        for i, line in enumerate(lines[5:25], 5):  # Lines 5-25 likely contain customer info
-            if (len(line) > 15 and 
-                any(word in line for word in ['Speedcast', 'Limited', 'Communications', 'Systems', 'Networks']) and
-                not any(skip in line.lower() for skip in ['vodafone', 'invoice', 'total', 'amount', 'tax'])):
-                logger.info(f"✅ Found PNG entity name (advanced): {line}")
+        for line in lines[5:25]:  # Lines 5-25 likely contain customer info
+            if len(line) <= 15 or not any(word in line for word in ENTITY_HINT_WORDS):
+                continue
+            line_lower = line.lower()
+            if not any(skip in line_lower for skip in ENTITY_SKIP_WORDS):
+                logger.info("✅ Found PNG entity name (advanced): %s", line)
                 return line
         
         logger.warning("❌ PNG Entity name not found")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG entity name: {e}")
+        logger.error("❌ Error extracting PNG entity name: %s", e)
         return None
 
-def extract_invoice_total_png(pdf_path: str) -> float:
+def extract_invoice_total_png_from_text(first_page_text: str) -> float:
     """
     Extract invoice total from Vodafone PNG invoice
     UPDATED: Based on actual PNG format "Total Current Charges (K) 16,775.00"
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.debug("🔍 Looking for PNG invoice total patterns...")
         
         # PRIMARY PATTERN: PNG-specific "Total Current Charges (K)" format
-        primary_pattern = r"Total Current Charges \(K\)\s+([\d,]+\.?\d*)"
-        match = re.search(primary_pattern, first_page_text, re.IGNORECASE)
+        match = TOTAL_CURRENT_CHARGES_RE.search(first_page_text)
         
         if match:
             total_str = match.group(1).replace(',', '')
             total = float(total_str)
-            logger.info(f"✅ Found PNG total: 'Total Current Charges (K) {match.group(1)}' → {total:,.2f}")
+            logger.info("✅ Found PNG total: 'Total Current Charges (K) %s' → %s", match.group(1), format(total, ',.2f'))
             return total
         
         # SECONDARY PATTERN: "Total Due (K)" from the highlighted box
-        total_due_pattern = r"Total Due \(K\)[:\s]+([\d,]+\.?\d*)"
-        match = re.search(total_due_pattern, first_page_text, re.IGNORECASE)
+        match = TOTAL_DUE_RE.search(first_page_text)
         
         if match:
             total_str = match.group(1).replace(',', '')
             total = float(total_str)
-            logger.info(f"✅ Found PNG total: 'Total Due (K) {match.group(1)}' → {total:,.2f}")
+            logger.info("✅ Found PNG total: 'Total Due (K) %s' → %s", match.group(1), format(total, ',.2f'))
             return total
         
         # FALLBACK PATTERNS: Other PNG total patterns with Kina currency
-        png_patterns = [
-            r"Total Amount[:\s]*\(K\)\s*([\d,]+\.?\d*)",           # With (K) indicator
-            r"Amount Due[:\s]*\(K\)\s*([\d,]+\.?\d*)",             # With (K) indicator
-            r"Invoice Total[:\s]*\(K\)\s*([\d,]+\.?\d*)",          # With (K) indicator
-            r"Balance Due[:\s]*\(K\)\s*([\d,]+\.?\d*)",            # With (K) indicator
-            r"Final Amount[:\s]*\(K\)\s*([\d,]+\.?\d*)",           # With (K) indicator
-            # Plain patterns without currency indicator
-            r"Total Amount[:\s]+([\d,]+\.?\d*)",
-            r"Amount Due[:\s]+([\d,]+\.?\d*)",
-            r"Total Due[:\s]+([\d,]+\.?\d*)",
-            r"Invoice Total[:\s]+([\d,]+\.?\d*)"
-        ]
-        
-        for pattern in png_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in TOTAL_RES:
+            match = pattern.search(first_page_text)
             if match:
                 total_str = match.group(1).replace(',', '')
                 total = float(total_str)
-                logger.info(f"✅ Found PNG total (fallback): {total:,.2f}")
+                logger.info("✅ Found PNG total (fallback): %s", format(total, ',.2f'))
                 return total
         
         # ADVANCED FALLBACK: Look for lines containing "total" + "(K)" + number
         lines = first_page_text.split('\n')
         for line in lines:
             line = line.strip()
-            if 'total' in line.lower() and '(k)' in line.lower():
+            line_lower = line.lower()
+            if 'total' in line_lower and '(k)' in line_lower:
                 # Look for number pattern in the line
-                number_match = re.search(r'([\d,]+\.?\d*)', line)
+                number_match = NUMBER_RE.search(line)
                 if number_match:
                     try:
                         total_str = number_match.group(1).replace(',', '')
                         total = float(total_str)
                         # Reasonable amount check (PNG Kina amounts)
                         if 100.00 <= total <= 1000000.00:
-                            logger.info(f"✅ Found PNG total (advanced): '{line.strip()}' → {total:,.2f}")
+                            logger.info("✅ Found PNG total (advanced): '%s' → %s", line.strip(), format(total, ',.2f'))
                             return total
                     except ValueError:
                         continue
         
-        # LAST RESORT: Find largest reasonable number on first page
-        numbers = re.findall(r'([\d,]+\.?\d{2})', first_page_text)
-        if numbers:
-            candidates = []
-            for num_str in numbers:
+        # LAST RESORT: Find largest reasonable amount on a total/due line
+        candidates = []
+        for line in lines:
+            line_lower = line.lower()
+            if 'total' not in line_lower and 'due' not in line_lower:
+                continue
+            for num_str in AMOUNT_RE.findall(line):
                 try:
                     num = float(num_str.replace(',', ''))
                     # Reasonable PNG invoice total range (in Kina)
@@ -529,17 +693,68 @@ def extract_invoice_total_png(pdf_path: str) -> float:
                         candidates.append(num)
                 except ValueError:
                     continue
-            
-            if candidates:
-                total = max(candidates)
-                logger.warning(f"⚠️ Using largest reasonable number as PNG total estimate: {total:,.2f}")
-                return total
+        
+        if candidates:
+            total = max(candidates)
+            logger.warning("⚠️ Using largest reasonable number as PNG total estimate: %s", format(total, ',.2f'))
+            return total
         
         logger.warning("❌ PNG Invoice total not found")
         return 0.0
         
     except Exception as e:
-        logger.error(f"❌ Error extracting PNG invoice total: {e}")
+        logger.error("❌ Error extracting PNG invoice total: %s", e)
+        return 0.0
+
+# Backward compatibility: path-based extractors open the PDF themselves.
+# extract_header reads the first page once and calls the *_from_text variants.
+
+def extract_vendor_name_png(pdf_path: str) -> str:
+    """Extract vendor name from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_vendor_name_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for vendor name: %s", e)
+        return "Vodafone PNG"
+
+def extract_invoice_id_png(pdf_path: str) -> str:
+    """Extract invoice ID from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_invoice_id_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for invoice ID: %s", e)
+        return None
+
+def extract_invoice_date_png(pdf_path: str) -> str:
+    """Extract invoice date from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_invoice_date_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for invoice date: %s", e)
+        return None
+
+def extract_ban_png(pdf_path: str) -> str:
+    """Extract BAN from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_ban_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for BAN: %s", e)
+        return None
+
+def extract_entity_name_png(pdf_path: str) -> str:
+    """Extract entity name from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_entity_name_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for entity name: %s", e)
+        return None
+
+def extract_invoice_total_png(pdf_path: str) -> float:
+    """Extract invoice total from a Vodafone PNG invoice PDF"""
+    try:
+        return extract_invoice_total_png_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading PNG invoice for invoice total: %s", e)
         return 0.0
 
 # Shared utility functions with PNG-specific modifications
@@ -559,142 +774,80 @@ def get_entity_id_from_catalog(entity_name: str) -> str:
         if not entity_name or entity_name == "UNKNOWN":
             return None
             
-        # Check if config module is available
+        # Clean the extracted entity name for better matching
+        clean_extracted = clean_entity_name_for_matching(entity_name)
+        logger.info("   🔍 Matching PNG entity: '%s' (cleaned: '%s')", entity_name, clean_extracted)
+        
+        # Strategy 1: exact match on the cleaned name, a dict lookup over the cached catalog.
+        # Cleaning canonicalises LTD → LIMITED on both sides, so "Speedcast PNG Ltd" and
+        # "Speedcast PNG Limited" already meet here without a separate Ltd/Limited variant pass.
         try:
-            from config.snowflake_config import get_snowflake_session
+            result, by_clean, vocab = _active_entities(_ttl_bucket())
         except ImportError as e:
-            logger.error(f"   ❌ Cannot import Snowflake config: {e}")
-            logger.error(f"   ❌ Run this parser from the project root directory where config/ exists")
+            logger.error("   ❌ Cannot import Snowflake config: %s", e)
+            logger.error("   ❌ Run this parser from the project root directory where config/ exists")
             return None
         
-        session = get_snowflake_session()
+        exact_match = by_clean.get(clean_extracted)
+        if exact_match:
+            catalog_entity_id, catalog_entity_name = exact_match[:2]
+            logger.info("   ✅ Exact PNG match: '%s' → %s (%s)", entity_name, catalog_entity_id, catalog_entity_name)
+            return catalog_entity_id
         
-        # Clean the extracted entity name for better matching
-        clean_extracted = clean_entity_name_for_matching(entity_name)
-        logger.info(f"   🔍 Matching PNG entity: '{entity_name}' (cleaned: '{clean_extracted}')")
-        
-        # Get all active entities from catalog
-        query = """
-            SELECT ENTITY_ID, ENTITY_NAME
-            FROM ENTITY_CATALOG
-            WHERE STATUS = 'Active'
-            ORDER BY ENTITY_NAME
-        """
-        
-        result = session.sql(query).collect()
+        # Core-name and fuzzy matching scan the same cached catalog
         if not result:
             logger.warning("   ⚠️ No active entities found in catalog")
             return None
         
-        # Try different matching strategies
-        for row in result:
-            catalog_entity_id = row[0]
-            catalog_entity_name = row[1]
-            clean_catalog = clean_entity_name_for_matching(catalog_entity_name)
-            
-            # Strategy 1: Exact match (cleaned and normalized)
-            if clean_extracted == clean_catalog:
-                logger.info(f"   ✅ Exact PNG match: '{entity_name}' → {catalog_entity_id} ({catalog_entity_name})")
-                return catalog_entity_id
-            
-            # Strategy 2: PNG-specific Ltd/Limited variant matching
-            # Handle "Speedcast PNG Ltd" ↔ "Speedcast PNG Limited"
-            if (clean_extracted.replace(' LIMITED', ' LTD') == clean_catalog.replace(' LIMITED', ' LTD') or
-                clean_extracted.replace(' LTD', ' LIMITED') == clean_catalog.replace(' LTD', ' LIMITED')):
-                logger.info(f"   ✅ PNG Ltd/Limited variant match: '{entity_name}' → {catalog_entity_id} ({catalog_entity_name})")
-                return catalog_entity_id
-            
+        extracted_core = extract_core_company_name(clean_extracted)
+        
+        for catalog_entity_id, catalog_entity_name, clean_catalog, _, _ in result:
             # Strategy 3: Core name match (handles business suffix variations)
-            extracted_core = extract_core_company_name(clean_extracted)
             catalog_core = extract_core_company_name(clean_catalog)
             
             if extracted_core == catalog_core and len(extracted_core) > 3:
-                logger.info(f"   ✅ Core PNG match: '{entity_name}' → {catalog_entity_id} ({catalog_entity_name})")
-                logger.info(f"       Core names: '{extracted_core}' = '{catalog_core}'")
+                logger.info("   ✅ Core PNG match: '%s' → %s (%s)", entity_name, catalog_entity_id, catalog_entity_name)
+                logger.info("       Core names: '%s' = '%s'", extracted_core, catalog_core)
                 return catalog_entity_id
         
         # Strategy 5: Fuzzy matching for close variants (fallback)
-        best_match = find_best_fuzzy_match(clean_extracted, result)
+        best_match = find_best_fuzzy_match(clean_extracted, result, vocab)
         if best_match:
             entity_id, matched_name, similarity = best_match
-            logger.info(f"   ✅ Fuzzy PNG match ({similarity:.1%}): '{entity_name}' → {entity_id} ({matched_name})")
+            logger.info("   ✅ Fuzzy PNG match (%.1f%%): '%s' → %s (%s)", similarity * 100, entity_name, entity_id, matched_name)
             return entity_id
         
-        logger.warning(f"   ⚠️ No PNG entity match found for '{entity_name}' in ENTITY_CATALOG")
+        logger.warning("   ⚠️ No PNG entity match found for '%s' in ENTITY_CATALOG", entity_name)
         return None
         
     except Exception as e:
-        logger.error(f"   ❌ Error looking up PNG entity ID for '{entity_name}': {e}")
+        logger.error("   ❌ Error looking up PNG entity ID for '%s': %s", entity_name, e)
         return None
 
+@functools.lru_cache(maxsize=4096)
 def clean_entity_name_for_matching(name: str) -> str:
     """Clean entity name for better matching - Enhanced for PNG variants"""
     if not name:
         return ""
     
-    # Convert to uppercase and remove extra spaces
-    cleaned = name.upper().strip()
-    
-    # Remove common punctuation
-    cleaned = cleaned.replace(',', '').replace('.', '').replace('-', ' ')
+    # Convert to uppercase and remove common punctuation in one pass
+    cleaned = name.upper().strip().translate(_PUNCT_TBL)
     
     # PNG-specific normalization: Handle Ltd/Limited variants
     cleaned = cleaned.replace(' LTD', ' LIMITED')
     cleaned = cleaned.replace(' CORP', ' CORPORATION')
     cleaned = cleaned.replace(' INC', ' INCORPORATED')
     
-    # Normalize multiple spaces
-    import re
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    return cleaned.strip()
-
-def normalize_vendor_name_for_matching(name: str) -> str:
-    """
-    Normalize vendor name for PNG matching
-    Handles: "Vodafone PNG Ltd" ↔ "VODAFONE PNG"
-    """
-    if not name:
-        return ""
-    
-    # Convert to uppercase and clean
-    cleaned = name.upper().strip()
-    
-    # Remove common punctuation
-    cleaned = cleaned.replace(',', '').replace('.', '').replace('-', ' ')
-    
-    # PNG-specific vendor normalization
-    # Remove business suffixes for vendor matching
-    suffixes_to_remove = [' LTD', ' LIMITED', ' INC', ' INCORPORATED', ' CORP', ' CORPORATION']
-    for suffix in suffixes_to_remove:
-        if cleaned.endswith(suffix):
-            cleaned = cleaned.replace(suffix, '').strip()
-    
-    # Normalize spaces
-    import re
-    cleaned = re.sub(r'\s+', ' ', cleaned)
-    
-    return cleaned.strip()
+    # Normalize multiple spaces (split/join collapses the same whitespace as \s+ and trims the ends)
+    return ' '.join(cleaned.split())
 
 def extract_core_company_name(name: str) -> str:
     """Extract core company name by removing common business suffixes"""
     if not name:
         return ""
     
-    # Common business suffixes to remove for matching
-    suffixes = [
-        'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'LLC', 'LTD', 'LIMITED',
-        'CO', 'COMPANY', 'LP', 'LLP', 'PLLC', 'PC', 'ENTERPRISES', 'HOLDINGS',
-        'GROUP', 'INTERNATIONAL', 'INTL', 'TECHNOLOGIES', 'TECH', 'SYSTEMS',
-        'SOLUTIONS', 'SERVICES', 'COMMUNICATIONS', 'COMM', 'TELECOM'
-    ]
-    
     words = name.split()
-    core_words = []
-    
-    for word in words:
-        if word not in suffixes:
-            core_words.append(word)
+    core_words = [word for word in words if word not in _SUFFIXES]
     
     # Keep meaningful core (at least first word)
     if not core_words and words:
@@ -702,6 +855,11 @@ def extract_core_company_name(name: str) -> str:
     
     return ' '.join(core_words)
 
+@functools.lru_cache(maxsize=4096)
+def _tokens(name: str) -> frozenset:
+    """Word set of a cleaned/normalized name, cached per name"""
+    return frozenset(name.split())
+
 def calculate_phrase_similarity(name1: str, name2: str) -> float:
     """
     Calculate similarity based on shared phrases/words
@@ -714,19 +872,15 @@ def calculate_phrase_similarity(name1: str, name2: str) -> float:
     if not name1 or not name2:
         return 0.0
     
-    # Split into words and remove empty strings
-    words1 = set([w for w in name1.split() if w])
-    words2 = set([w for w in name2.split() if w])
+    # Split into word sets
+    words1 = _tokens(name1)
+    words2 = _tokens(name2)
     
     if not words1 or not words2:
         return 0.0
     
-    # Calculate intersection and union
-    common_words = words1.intersection(words2)
-    all_unique_words = words1.union(words2)
-    
     # Jaccard similarity: common words / all unique words
-    similarity = len(common_words) / len(all_unique_words)
+    similarity = len(words1 & words2) / len(words1 | words2)
     
     return similarity
 
@@ -743,108 +897,166 @@ def calculate_vendor_phrase_similarity(vendor1: str, vendor2: str) -> float:
     norm1 = normalize_vendor_name_for_matching(vendor1)
     norm2 = normalize_vendor_name_for_matching(vendor2)
     
-    # Split into words
-    words1 = set([w for w in norm1.split() if w])
-    words2 = set([w for w in norm2.split() if w])
-    
-    if not words1 or not words2:
+    if not norm1 or not norm2:
         return 0.0
     
+    # Fast path: equal names or a whole-word prefix are subset matches, no word sets needed
+    if norm1 == norm2 or norm2.startswith(norm1 + ' ') or norm1.startswith(norm2 + ' '):
+        return 0.9
+    
+    # Split into word sets
+    words1 = _tokens(norm1)
+    words2 = _tokens(norm2)
+    common_words = words1 & words2
+    
     # Special handling: if one is subset of other, high similarity
-    if words1.issubset(words2) or words2.issubset(words1):
+    if common_words == words1 or common_words == words2:
         return 0.9  # Very high similarity for subset matches
     
     # Otherwise use standard Jaccard similarity
-    common_words = words1.intersection(words2)
-    all_unique_words = words1.union(words2)
-    
-    return len(common_words) / len(all_unique_words)
-def find_best_fuzzy_match(target: str, catalog_results: list, min_similarity: float = 0.6) -> tuple:
-    """Find best fuzzy match using phrase-based similarity scoring (lowered threshold)"""
+    return len(common_words) / len(words1 | words2)
+
+def find_best_fuzzy_match(target: str, catalog_results: tuple, vocab: dict, min_similarity: float = 0.6) -> tuple:
+    """
+    Find best fuzzy match using phrase-based similarity scoring (lowered threshold)
+    catalog_results and vocab are the rows and word bits loaded by _active_entities
+    """
     if not target or not catalog_results:
         return None
-    
+
+    # Same Jaccard score as calculate_phrase_similarity, against the catalog's word masks.
+    # Target words the catalog never uses have no bit: they cannot intersect and only
+    # count towards the union, through target_len.
+    target_words = set(target.split())
+    target_len = len(target_words)
+    if not target_len:
+        return None
+    target_mask = 0
+    for token in target_words:
+        bit = vocab.get(token)
+        if bit is not None:
+            target_mask |= 1 << bit
+
     best_match = None
-    best_similarity = 0.0
-    
-    for row in catalog_results:
-        catalog_entity_id = row[0]
-        catalog_entity_name = row[1]
-        clean_catalog = clean_entity_name_for_matching(catalog_entity_name)
-        
-        # Use phrase similarity instead of simple word intersection
-        similarity = calculate_phrase_similarity(target, clean_catalog)
-        
-        if similarity > best_similarity and similarity >= min_similarity:
+    # Start just under the threshold so "> best" alone also enforces ">= min_similarity"
+    # (a score of 0.0 never matches, as before)
+    best_similarity = max(min_similarity - 1e-9, 0.0)
+
+    for catalog_entity_id, catalog_entity_name, _, mask, token_count in catalog_results:
+        if not token_count:
+            continue
+
+        # Jaccard can never exceed smaller/larger word count; skip rows that cannot win
+        if token_count < target_len:
+            bound = token_count / target_len
+        else:
+            bound = target_len / token_count
+        if bound <= best_similarity:
+            continue
+
+        common = (target_mask & mask).bit_count()
+        similarity = common / (target_len + token_count - common)
+
+        if similarity > best_similarity:
             best_similarity = similarity
             best_match = (catalog_entity_id, catalog_entity_name, similarity)
-    
+            if similarity == 1.0:
+                break  # identical word sets; no later row can score higher
+
     return best_match
 
+@functools.lru_cache(maxsize=1)
+def _vendor_code_index(ttl_bucket: int) -> dict:
+    """All active ENTITY_VENDOR_MAPPING rows as {(entity_id, vendor_name): vendor_code}, fetched once per TTL window"""
+    session = _snowflake_session()
+    
+    query = """
+        SELECT ENTITY_ID, VENDOR_NAME, ENTITY_VENDOR_CODE
+        FROM ENTITY_VENDOR_MAPPING
+        WHERE STATUS = 'Active'
+    """
+    
+    index = {}
+    for row in session.sql(query).collect():
+        # setdefault keeps the first row per key, like the old LIMIT 1 lookup
+        index.setdefault((row[0], row[1]), row[2])
+    return index
+
+# Most recent lookups reported as missing, LRU-ordered; repeats are logged at debug level only
+REPORTED_MISSES_SIZE = 1024
+_REPORTED_MISSES = OrderedDict()
+_REPORTED_MISSES_LOCK = threading.Lock()
+
+def _report_miss(key: tuple, message: str):
+    """Warn the first time a lookup key is missing, then drop to debug"""
+    with _REPORTED_MISSES_LOCK:
+        seen = key in _REPORTED_MISSES
+        if seen:
+            _REPORTED_MISSES.move_to_end(key)
+        else:
+            _REPORTED_MISSES[key] = None
+            if len(_REPORTED_MISSES) > REPORTED_MISSES_SIZE:
+                _REPORTED_MISSES.popitem(last=False)
+    
+    if seen:
+        logger.debug(message)
+    else:
+        logger.warning(message)
+
+def clear_vendor_mapping_cache():
+    """Drop the cached vendor mapping/currency indexes, e.g. after the catalogs were edited"""
+    _vendor_code_index.cache_clear()
+    _vendor_currency_index.cache_clear()
+    with _REPORTED_MISSES_LOCK:
+        _REPORTED_MISSES.clear()
+
 def get_vendor_code_from_mapping(entity_id: str, vendor_name: str) -> str:
     """Get vendor code from ENTITY_VENDOR_MAPPING table - PNG version"""
     try:
         if not entity_id or not vendor_name:
             return None
-            
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
-        query = f"""
-            SELECT ENTITY_VENDOR_CODE
-            FROM ENTITY_VENDOR_MAPPING
-            WHERE ENTITY_ID = '{entity_id}' 
-            AND VENDOR_NAME = '{vendor_name.replace("'", "''")}' 
-            AND STATUS = 'Active'
-            LIMIT 1
-        """
-        
-        result = session.sql(query).collect()
-        if result and len(result) > 0:
-            vendor_code = result[0][0]
-            logger.info(f"   ✅ Found PNG vendor mapping: Entity {entity_id} + {vendor_name} → {vendor_code}")
+        
+        vendor_code = _vendor_code_index(_ttl_bucket()).get((entity_id, vendor_name))
+        if vendor_code:
+            logger.info("   ✅ Found PNG vendor mapping: Entity %s + %s → %s", entity_id, vendor_name, vendor_code)
             return vendor_code
         else:
-            logger.warning(f"   ⚠️ No PNG vendor mapping found for Entity {entity_id} + {vendor_name}")
+            _report_miss(('mapping', entity_id, vendor_name),
+                         f"   ⚠️ No PNG vendor mapping found for Entity {entity_id} + {vendor_name}")
             return None
             
     except Exception as e:
-        logger.error(f"   ❌ Error querying PNG vendor mapping: {e}")
+        logger.error("   ❌ Error querying PNG vendor mapping: %s", e)
         return None
 
+@functools.lru_cache(maxsize=1)
+def _vendor_currency_index(ttl_bucket: int) -> dict:
+    """All active VENDOR_CATALOG currencies as {vendor_name: currency}, fetched once per TTL window"""
+    session = _snowflake_session()
+    
+    query = """
+        SELECT VENDOR_NAME, CURRENCY
+        FROM VENDOR_CATALOG
+        WHERE STATUS = 'Active'
+    """
+    
+    index = {}
+    for row in session.sql(query).collect():
+        index.setdefault(row[0], row[1])
+    return index
+
 def get_vendor_currency(vendor_name: str) -> str:
     """Get currency from vendor catalog - PNG version"""
     try:
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
-        query = f"""
-            SELECT CURRENCY
-            FROM VENDOR_CATALOG 
-            WHERE VENDOR_NAME = '{vendor_name.replace("'", "''")}' 
-            AND STATUS = 'Active'
-            LIMIT 1
-        """
-        
-        result = session.sql(query).collect()
-        if result and result[0][0]:
-            currency = result[0][0]
-            logger.info(f"   ✅ Found PNG currency: {currency}")
+        currency = _vendor_currency_index(_ttl_bucket()).get(vendor_name)
+        if currency:
+            logger.info("   ✅ Found PNG currency: %s", currency)
             return currency
         else:
-            logger.warning(f"   ⚠️ Vendor '{vendor_name}' not found in catalog - using default PGK")
+            _report_miss(('currency', vendor_name),
+                         f"   ⚠️ Vendor '{vendor_name}' not found in catalog - using default PGK")
             return 'PGK'  # Default for Vodafone PNG (Papua New Guinea Kina)
             
     except Exception as e:
-        logger.warning(f"   ⚠️ Error looking up PNG vendor currency: {e}")
+        logger.warning("   ⚠️ Error looking up PNG vendor currency: %s", e)
         return 'PGK'
-
-# For integration testing only - use separate test module from project root
-if __name__ == "__main__":
-    print("⚠️  Don't run this parser directly!")
-    print("📝 Use a test module from project root instead:")
-    print("   python test_png_parser.py")
-    print("")
-    print("🔧 Or integrate with your batch processor:")
-    print("   from parsers.headers.vodafone_png_header import extract_header")
-    print("   header_df = extract_header('path/to/invoice.pdf')")
\ No newline at end of file
@@ -9,34 +9,135 @@ import fitz  # PyMuPDF
 import re
 import pandas as pd
 from datetime import datetime
+import functools
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# The Snowflake config lives at the project root; without it only catalog lookups fail
+try:
+    from config.snowflake_config import get_snowflake_session
+except ImportError:
+    get_snowflake_session = None
+
+# Snowpark sessions aren't shared across threads, and a forked worker must not reuse its parent's
+_SESSION = threading.local()
+
+# Catalog tables change rarely; the cached copies are reloaded every TTL window
+CATALOG_CACHE_TTL_SECONDS = 300
+
+# Long-form business suffixes folded to their short form in one regex pass
+_SUFFIX_SHORT_FORMS = {'LIMITED': 'LTD', 'INCORPORATED': 'INC', 'CORPORATION': 'CORP'}
+_SUFFIX_LONG_FORM_RE = re.compile(r' (LIMITED|INCORPORATED|CORPORATION)')
+
+# Commas and periods dropped, hyphens turned into spaces, in one pass
+_PUNCT_TBL = str.maketrans({',': None, '.': None, '-': ' '})
+
+# Business suffixes ignored when comparing core company names
+_BIZ_SUFFIXES = frozenset({
+    'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'LLC', 'LTD', 'LIMITED',
+    'CO', 'COMPANY', 'LP', 'LLP', 'PLLC', 'PC', 'ENTERPRISES', 'HOLDINGS',
+    'GROUP', 'INTERNATIONAL', 'INTL', 'TECHNOLOGIES', 'TECH', 'SYSTEMS',
+    'SOLUTIONS', 'SERVICES', 'COMMUNICATIONS', 'COMM', 'TELECOM', 'SA',
+    'PTE', 'PTY', 'BV', 'NV', 'SRL', 'SARL', 'GMBH', 'AG', 'AB', 'AS'
+})
+
+# Invoice field patterns, compiled once at import
+_DATE_RE = re.compile(r'^\d{1,2}\s+\w{3}\s+\d{4}$')
+_DATE_SEARCH_RE = re.compile(r'\b(\d{1,2}\s+\w{3}\s+\d{4})\b')
+_REG_ADDR_RE = re.compile(r'Your registered address:\s*([^,]+),', re.IGNORECASE)
+# From example: "Vodafone Limited, Vodafone House, The Connection, Newbury, Berkshire, RG14 2FN..."
+# One scan finds every "Vodafone " and which known form follows it, in priority order:
+# "Vodafone Limited," > "Vodafone Limited" > "Vodafone Business UK" > "Vodafone UK"
+_VENDOR_RE = re.compile(r'(Vodafone (?:(Limited)|(Business UK)|(UK))?)([,\s])?', re.IGNORECASE)
+_VENDOR_LINE_RE = re.compile(r'(Vodafone Limited)', re.IGNORECASE)
+_VENDOR_FALLBACK_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(Vodafone [^,\n]*Limited[^,\n]*)',
+    r'(Vodafone [^,\n]*UK[^,\n]*)',
+    r'(Vodafone [^,\n]*Business[^,\n]*)',
+))
+_VAT_TOTAL_RE = re.compile(r"This month's charges after VAT\s+([\d,]+\.?\d*)", re.IGNORECASE)
+_GBP_TOTAL_RE = re.compile(r'([\d,]+\.?\d*)\s+GBP\s*\n\s*Total', re.IGNORECASE)
+_TOTAL_FALLBACK_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"Total due[:\s]*£?([\d,]+\.?\d*)",
+    r"Amount due[:\s]*£?([\d,]+\.?\d*)",
+    r"Invoice total[:\s]*£?([\d,]+\.?\d*)",
+    r"Total amount[:\s]*£?([\d,]+\.?\d*)",
+    r"Balance due[:\s]*£?([\d,]+\.?\d*)",
+    r"Total charges[:\s]*£?([\d,]+\.?\d*)",
+    r"Total[:\s]+([\d,]+\.?\d*)",
+    r"Amount[:\s]+([\d,]+\.?\d*)",
+))
+_WS_RE = re.compile(r'\s+')
+
+def _first_page_text(pdf_path: str) -> str:
+    """Open the PDF once and return the text of its first page"""
+    with fitz.open(pdf_path) as doc:
+        return doc[0].get_text()
+
+def _page_lines(first_page_text: str) -> list:
+    """Stripped, non-empty lines of the page text"""
+    return [stripped for line in first_page_text.splitlines() if (stripped := line.strip())]
+
+# Labels whose value is printed on the line after them -> field they carry
+_FIELD_LABELS = {
+    "Your invoice number": "invoice_id",
+    "Your account number": "ban",
+    "Invoice": "invoice_date_raw",
+    "Invoice Date": "invoice_date_labeled",
+}
+
+def _scan_labeled_fields(lines: list) -> dict:
+    """One pass over the page: field -> values on the line after each of its labels, in page order"""
+    fields = {}
+    for idx in range(len(lines) - 1):
+        field = _FIELD_LABELS.get(lines[idx])
+        if field:
+            fields.setdefault(field, []).append(lines[idx + 1])
+    return fields
+
 def extract_header(pdf_path: str) -> pd.DataFrame:
     """
     Extract header information from Vodafone UK invoice
     Following the standardized 3-step validation process
     """
+    header_data = extract_header_dict(pdf_path)
+    if not header_data:
+        return pd.DataFrame()
+    return pd.DataFrame([header_data])
+
+def extract_header_dict(pdf_path: str) -> dict:
+    """
+    Extract header information from Vodafone UK invoice as a plain record
+    Batch callers should build one DataFrame from many records instead of one per invoice
+    Returns an empty dict on failure
+    """
     try:
-        logger.info(f"🔄 Extracting Vodafone UK header from: {os.path.basename(pdf_path)}")
+        logger.info("🔄 Extracting Vodafone UK header from: %s", os.path.basename(pdf_path))
+        
+        # The PDF is opened, split into lines and scanned for labeled fields once
+        first_page_text = _first_page_text(pdf_path)
+        lines = _page_lines(first_page_text)
+        fields = _scan_labeled_fields(lines)
         
         # STEP 1: Extract basic invoice data
-        invoice_id = extract_invoice_id_from_first_page(pdf_path)
-        invoice_date = extract_invoice_date_from_first_page(pdf_path)  # FIXED
-        ban = extract_ban_from_first_page(pdf_path)
-        invoice_total = extract_invoice_total_from_first_page(pdf_path)
+        invoice_id = extract_invoice_id_from_text(first_page_text, lines, fields)
+        invoice_date = extract_invoice_date_from_text(first_page_text, lines, fields)  # FIXED
+        ban = extract_ban_from_text(first_page_text, lines, fields)
+        invoice_total = extract_invoice_total_from_text(first_page_text)
         
         # STEP 2: MANDATORY 3-STEP VALIDATION PROCESS
         # 2A: Extract entity name from invoice and get entity_id
-        entity_name = extract_entity_name_from_registered_address(pdf_path)
+        entity_name = extract_entity_name_from_text(first_page_text)
         entity_id = get_entity_id_from_catalog(entity_name)
         
         # 2B: Extract vendor name from invoice and get catalog vendor + currency
-        extracted_vendor_name = extract_vendor_name_uk(pdf_path)  # FIXED
+        extracted_vendor_name = extract_vendor_name_uk_from_text(first_page_text, lines)  # FIXED
         vendor_name = get_catalog_vendor_name(extracted_vendor_name)
         currency = get_vendor_currency(vendor_name)
         
@@ -57,13 +158,13 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
             logger.warning("⚠️ Vodafone UK Entity name not found - NO FALLBACK")
         
         if not entity_id:
-            logger.warning(f"⚠️ Entity ID not found for '{entity_name}'")
+            logger.warning("⚠️ Entity ID not found for '%s'", entity_name)
         
         if not vendor_code:
-            logger.warning(f"⚠️ Entity-Vendor Code not found for Entity {entity_id} + {vendor_name}")
+            logger.warning("⚠️ Entity-Vendor Code not found for Entity %s + %s", entity_id, vendor_name)
         
         if not currency:
-            logger.warning(f"⚠️ Currency not found for vendor '{vendor_name}' - NO FALLBACK")
+            logger.warning("⚠️ Currency not found for vendor '%s' - NO FALLBACK", vendor_name)
         
         # Create header record in standard format - NO FALLBACKS ALLOWED
         header_data = {
@@ -84,100 +185,124 @@ def extract_header(pdf_path: str) -> pd.DataFrame:
             'created_at': datetime.now()
         }
         
-        logger.info(f"✅ Vodafone UK header extracted successfully")
-        logger.info(f"   Invoice ID: {header_data['invoice_id']}")
-        logger.info(f"   Vendor: {header_data['vendor']} (using catalog name)")
-        logger.info(f"   Entity Extracted: {header_data['entity_name_extracted']} (from invoice)")
-        logger.info(f"   Entity ID: {header_data['invoiced_bu']}")
-        logger.info(f"   Vendor Code: {header_data['vendorno']}")
-        logger.info(f"   Currency: {header_data['currency']}")
-        logger.info(f"   BAN: {header_data['ban']}")
-        logger.info(f"   Date: {header_data['billing_period']}")
-        logger.info(f"   Total: {header_data['currency']} {header_data['invoice_total']:,.2f}")
+        logger.info("✅ Vodafone UK header extracted successfully")
+        logger.info("   Invoice ID: %s", header_data['invoice_id'])
+        logger.info("   Vendor: %s (using catalog name)", header_data['vendor'])
+        logger.info("   Entity Extracted: %s (from invoice)", header_data['entity_name_extracted'])
+        logger.info("   Entity ID: %s", header_data['invoiced_bu'])
+        logger.info("   Vendor Code: %s", header_data['vendorno'])
+        logger.info("   Currency: %s", header_data['currency'])
+        logger.info("   BAN: %s", header_data['ban'])
+        logger.info("   Date: %s", header_data['billing_period'])
+        logger.info("   Total: %s %s", header_data['currency'], format(header_data['invoice_total'], ',.2f'))
         
-        return pd.DataFrame([header_data])
+        return header_data
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK header: {e}")
+        logger.error("❌ Error extracting Vodafone UK header: %s", e)
+        return {}
+
+def _warm_catalog_cache():
+    """Load the entity, vendor and mapping catalogs once; also the process-pool initializer"""
+    try:
+        ttl_bucket = _ttl_bucket()
+        _load_entity_catalog(ttl_bucket)
+        _load_vendor_catalog(ttl_bucket)
+        _load_entity_vendor_mapping(ttl_bucket)
+    except Exception as e:
+        logger.warning("⚠️ Could not pre-load Vodafone UK catalogs: %s", e)
+
+def extract_headers_batch(pdf_paths: list, max_workers: int = None) -> pd.DataFrame:
+    """
+    Extract headers from many Vodafone UK invoices using worker processes
+    Catalogs are loaded once up front (and once per worker) instead of per invoice
+    Returns one header row per successfully parsed invoice, in input order
+    """
+    if not pdf_paths:
+        return pd.DataFrame()
+    
+    _warm_catalog_cache()
+    
+    workers = min(max_workers or os.cpu_count() or 1, len(pdf_paths))
+    if workers <= 1:
+        records = [extract_header_dict(pdf_path) for pdf_path in pdf_paths]
+    else:
+        logger.info("🔄 Extracting %d Vodafone UK headers with %d workers", len(pdf_paths), workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_catalog_cache) as pool:
+            records = list(pool.map(extract_header_dict, pdf_paths))
+    
+    # Build the DataFrame once from all records rather than one frame per invoice
+    records = [record for record in records if record]
+    if not records:
         return pd.DataFrame()
+    return pd.DataFrame.from_records(records)
 
-def extract_invoice_id_from_first_page(pdf_path: str) -> str:
+def extract_invoice_id_from_text(first_page_text: str, lines: list = None, fields: dict = None) -> str:
     """Extract invoice ID from first page using 'Your invoice number' pattern"""
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
+        if fields is None:
+            fields = _scan_labeled_fields(lines if lines is not None else _page_lines(first_page_text))
         
-        lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
-        
-        for idx, line in enumerate(lines):
-            if line.strip() == "Your invoice number" and idx + 1 < len(lines):
-                invoice_id = lines[idx + 1].strip()
-                logger.info(f"✅ Found Vodafone UK invoice ID: {invoice_id}")
-                return invoice_id
+        for invoice_id in fields.get("invoice_id", ()):
+            logger.info("✅ Found Vodafone UK invoice ID: %s", invoice_id)
+            return invoice_id
         
         logger.warning("❌ Vodafone UK Invoice ID not found using 'Your invoice number' pattern")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK invoice ID: {e}")
+        logger.error("❌ Error extracting Vodafone UK invoice ID: %s", e)
         return None
 
-def extract_invoice_date_from_first_page(pdf_path: str) -> str:
+def extract_invoice_date_from_text(first_page_text: str, lines: list = None, fields: dict = None) -> str:
     """
     FIXED: Extract invoice date from first page - handles Vodafone UK format
     The date appears at top of page after "Invoice" without a label
     Format: "Invoice\n01 Jun 2025"
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
-        lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
+        if lines is None:
+            lines = _page_lines(first_page_text)
+        if fields is None:
+            fields = _scan_labeled_fields(lines)
         
         logger.info("🔍 Looking for Vodafone UK invoice date patterns...")
         
         # PRIMARY PATTERN: Date appears immediately after "Invoice" line
-        for idx, line in enumerate(lines):
-            if line.strip() == "Invoice" and idx + 1 < len(lines):
-                potential_date = lines[idx + 1].strip()
-                logger.info(f"   Found line after 'Invoice': '{potential_date}'")
-                
-                # Check if this looks like a date (DD Mon YYYY format)
-                date_pattern = r'^\d{1,2}\s+\w{3}\s+\d{4}$'
-                if re.match(date_pattern, potential_date):
-                    try:
-                        parsed_date = datetime.strptime(potential_date, "%d %b %Y")
-                        formatted_date = parsed_date.strftime("%Y-%m-%d")
-                        logger.info(f"✅ Found Vodafone UK invoice date: {potential_date} → {formatted_date}")
-                        return formatted_date
-                    except ValueError as e:
-                        logger.warning(f"⚠️ Could not parse date format: {potential_date} ({e})")
-                        return potential_date
-        
-        # FALLBACK PATTERN: Traditional "Invoice Date" label
-        for idx, line in enumerate(lines):
-            if line.strip() == "Invoice Date" and idx + 1 < len(lines):
-                date_str = lines[idx + 1].strip()
+        for potential_date in fields.get("invoice_date_raw", ()):
+            logger.info("   Found line after 'Invoice': '%s'", potential_date)
+            
+            # Check if this looks like a date (DD Mon YYYY format)
+            if _DATE_RE.match(potential_date):
                 try:
-                    parsed_date = datetime.strptime(date_str, "%d %b %Y")
+                    parsed_date = datetime.strptime(potential_date, "%d %b %Y")
                     formatted_date = parsed_date.strftime("%Y-%m-%d")
-                    logger.info(f"✅ Found Vodafone UK invoice date (fallback): {date_str} → {formatted_date}")
+                    logger.info("✅ Found Vodafone UK invoice date: %s → %s", potential_date, formatted_date)
                     return formatted_date
-                except ValueError:
-                    logger.warning(f"⚠️ Could not parse Vodafone UK date format: {date_str}")
-                    return date_str
+                except ValueError as e:
+                    logger.warning("⚠️ Could not parse date format: %s (%s)", potential_date, e)
+                    return potential_date
+        
+        # FALLBACK PATTERN: Traditional "Invoice Date" label
+        for date_str in fields.get("invoice_date_labeled", ()):
+            try:
+                parsed_date = datetime.strptime(date_str, "%d %b %Y")
+                formatted_date = parsed_date.strftime("%Y-%m-%d")
+                logger.info("✅ Found Vodafone UK invoice date (fallback): %s → %s", date_str, formatted_date)
+                return formatted_date
+            except ValueError:
+                logger.warning("⚠️ Could not parse Vodafone UK date format: %s", date_str)
+                return date_str
         
         # REGEX FALLBACK: Look for date pattern anywhere in first 10 lines
         for line in lines[:10]:
-            date_match = re.search(r'\b(\d{1,2}\s+\w{3}\s+\d{4})\b', line)
+            date_match = _DATE_SEARCH_RE.search(line)
             if date_match:
                 date_str = date_match.group(1)
                 try:
                     parsed_date = datetime.strptime(date_str, "%d %b %Y")
                     formatted_date = parsed_date.strftime("%Y-%m-%d")
-                    logger.info(f"✅ Found Vodafone UK date (regex): {date_str} → {formatted_date}")
+                    logger.info("✅ Found Vodafone UK date (regex): %s → %s", date_str, formatted_date)
                     return formatted_date
                 except ValueError:
                     continue
@@ -186,357 +311,408 @@ def extract_invoice_date_from_first_page(pdf_path: str) -> str:
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK invoice date: {e}")
+        logger.error("❌ Error extracting Vodafone UK invoice date: %s", e)
         return None
 
-def extract_ban_from_first_page(pdf_path: str) -> str:
+def extract_ban_from_text(first_page_text: str, lines: list = None, fields: dict = None) -> str:
     """Extract BAN from first page using 'Your account number' pattern"""
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
+        if fields is None:
+            fields = _scan_labeled_fields(lines if lines is not None else _page_lines(first_page_text))
         
-        lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
-        
-        for idx, line in enumerate(lines):
-            if line.strip() == "Your account number" and idx + 1 < len(lines):
-                ban = lines[idx + 1].strip()
-                logger.info(f"✅ Found Vodafone UK BAN: {ban}")
-                return ban
+        for ban in fields.get("ban", ()):
+            logger.info("✅ Found Vodafone UK BAN: %s", ban)
+            return ban
         
         logger.warning("❌ Vodafone UK BAN not found using 'Your account number' pattern")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK BAN: {e}")
+        logger.error("❌ Error extracting Vodafone UK BAN: %s", e)
         return None
 
-def extract_entity_name_from_registered_address(pdf_path: str) -> str:
+def extract_entity_name_from_text(first_page_text: str) -> str:
     """Extract entity name from 'Your registered address:' line"""
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
-        # Look for the registered address pattern
-        pattern = r'Your registered address:\s*([^,]+),'
-        match = re.search(pattern, first_page_text, re.IGNORECASE)
+        # Look for the registered address pattern; \s* also spans the line break,
+        # so a name printed on the line after the label is matched here too
+        match = _REG_ADDR_RE.search(first_page_text)
         
         if match:
             entity_name = match.group(1).strip()
-            logger.info(f"✅ Found Vodafone UK entity name from registered address: {entity_name}")
+            logger.info("✅ Found Vodafone UK entity name from registered address: %s", entity_name)
             return entity_name
         
-        # Fallback: look for multiline pattern
-        lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
-        
-        for idx, line in enumerate(lines):
-            if "your registered address:" in line.lower():
-                # Entity name might be on the same line or next line
-                if idx + 1 < len(lines):
-                    next_line = lines[idx + 1].strip()
-                    if ',' in next_line:
-                        entity_name = next_line.split(',')[0].strip()
-                        logger.info(f"✅ Found Vodafone UK entity name (multiline): {entity_name}")
-                        return entity_name
-                
-                # Check if entity name is on same line after colon
-                if ':' in line:
-                    after_colon = line.split(':', 1)[1].strip()
-                    if ',' in after_colon:
-                        entity_name = after_colon.split(',')[0].strip()
-                        logger.info(f"✅ Found Vodafone UK entity name (same line): {entity_name}")
-                        return entity_name
-                break
-        
         logger.warning("❌ Vodafone UK Entity name not found in registered address")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK entity name: {e}")
+        logger.error("❌ Error extracting Vodafone UK entity name: %s", e)
         return None
 
-def extract_vendor_name_uk(pdf_path: str) -> str:
+def _primary_vendor_name(first_page_text: str) -> tuple:
+    """
+    Highest-priority known Vodafone name form on the page as (name, rank).
+    name is None when "Vodafone " only appears in other forms; rank is None when it never appears.
+    """
+    best_name = None
+    best_rank = None
+    for match in _VENDOR_RE.finditer(first_page_text):
+        if match.group(2):
+            rank = 0 if match.group(5) else 1
+        elif match.group(3):
+            rank = 2
+        elif match.group(4):
+            rank = 3
+        else:
+            rank = 4
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            if rank < 4:
+                best_name = match.group(1)
+            if rank == 0:
+                break
+    return best_name, best_rank
+
+def extract_vendor_name_uk_from_text(first_page_text: str, lines: list = None) -> str:
     """
     FIXED: Extract vendor name from UK invoice
     Looks for "Vodafone Limited" at the bottom of the page
     """
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.info("🔍 Looking for Vodafone UK vendor name patterns...")
         
         # PRIMARY PATTERN: "Vodafone Limited" that appears at bottom
-        # From example: "Vodafone Limited, Vodafone House, The Connection, Newbury, Berkshire, RG14 2FN..."
-        vendor_patterns = [
-            r'(Vodafone Limited)(?:,|\s)',  # Most specific - matches "Vodafone Limited,"
-            r'(Vodafone Limited)',          # Exact match
-            r'(Vodafone Business UK)',      # Alternative business name
-            r'(Vodafone UK)',              # Shortened form
-        ]
-        
-        for pattern in vendor_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
-            if match:
-                vendor_name = match.group(1)
-                logger.info(f"✅ Found Vodafone UK vendor name: '{vendor_name}'")
-                return vendor_name
+        vendor_name, rank = _primary_vendor_name(first_page_text)
+        if vendor_name:
+            logger.info("✅ Found Vodafone UK vendor name: '%s'", vendor_name)
+            return vendor_name
+        if rank is None:
+            # Every remaining pattern needs "Vodafone " somewhere on the page
+            logger.warning("❌ Vodafone UK vendor name not found")
+            return None
         
         # FALLBACK: Look line by line for vendor information
-        lines = [line.strip() for line in first_page_text.splitlines() if line.strip()]
+        if lines is None:
+            lines = _page_lines(first_page_text)
         
         # Check last 10 lines for vendor info (typically at bottom)
         for line in lines[-10:]:
             if 'vodafone limited' in line.lower():
                 # Extract just "Vodafone Limited" from the line
-                vendor_match = re.search(r'(Vodafone Limited)', line, re.IGNORECASE)
+                vendor_match = _VENDOR_LINE_RE.search(line)
                 if vendor_match:
                     vendor_name = vendor_match.group(1)
-                    logger.info(f"✅ Found Vodafone UK vendor name (line scan): '{vendor_name}'")
+                    logger.info("✅ Found Vodafone UK vendor name (line scan): '%s'", vendor_name)
                     return vendor_name
         
         # ADVANCED FALLBACK: Look for any Vodafone reference
-        vodafone_patterns = [
-            r'(Vodafone [^,\n]*Limited[^,\n]*)',
-            r'(Vodafone [^,\n]*UK[^,\n]*)',
-            r'(Vodafone [^,\n]*Business[^,\n]*)',
-        ]
-        
-        for pattern in vodafone_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in _VENDOR_FALLBACK_RES:
+            match = pattern.search(first_page_text)
             if match:
                 vendor_name = match.group(1).strip()
-                logger.info(f"✅ Found Vodafone UK vendor name (advanced): '{vendor_name}'")
+                logger.info("✅ Found Vodafone UK vendor name (advanced): '%s'", vendor_name)
                 return vendor_name
         
         logger.warning("❌ Vodafone UK vendor name not found")
         return None
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK vendor name: {e}")
+        logger.error("❌ Error extracting Vodafone UK vendor name: %s", e)
         return None
 
-def extract_invoice_total_from_first_page(pdf_path: str) -> float:
+def extract_invoice_total_from_text(first_page_text: str) -> float:
     """Extract invoice total from first page - Vodafone UK format"""
     try:
-        doc = fitz.open(pdf_path)
-        first_page_text = doc[0].get_text()
-        doc.close()
-        
         logger.info("🔍 Looking for Vodafone UK invoice total...")
         
         # Primary pattern: "This month's charges after VAT 15,238.08"
-        voda_pattern = r"This month's charges after VAT\s+([\d,]+\.?\d*)"
-        match = re.search(voda_pattern, first_page_text, re.IGNORECASE)
+        match = _VAT_TOTAL_RE.search(first_page_text)
         
         if match:
             total_str = match.group(1).replace(',', '')
             total = float(total_str)
-            logger.info(f"✅ Found Vodafone UK total: {total:,.2f}")
+            logger.info("✅ Found Vodafone UK total: %s", format(total, ',.2f'))
             return total
         
         # Alternative pattern from the example: Look for amount before "GBP" and "Total"
         # "15,238.08 GBP\nTotal"
-        gbp_total_pattern = r'([\d,]+\.?\d*)\s+GBP\s*\n\s*Total'
-        match = re.search(gbp_total_pattern, first_page_text, re.IGNORECASE)
+        match = _GBP_TOTAL_RE.search(first_page_text)
         
         if match:
             total_str = match.group(1).replace(',', '')
             total = float(total_str)
-            logger.info(f"✅ Found Vodafone UK total (GBP pattern): {total:,.2f}")
+            logger.info("✅ Found Vodafone UK total (GBP pattern): %s", format(total, ',.2f'))
             return total
         
         # Fallback patterns
-        fallback_patterns = [
-            r"Total due[:\s]*£?([\d,]+\.?\d*)",
-            r"Amount due[:\s]*£?([\d,]+\.?\d*)", 
-            r"Invoice total[:\s]*£?([\d,]+\.?\d*)",
-            r"Total amount[:\s]*£?([\d,]+\.?\d*)",
-            r"Balance due[:\s]*£?([\d,]+\.?\d*)",
-            r"Total charges[:\s]*£?([\d,]+\.?\d*)",
-            r"Total[:\s]+([\d,]+\.?\d*)",
-            r"Amount[:\s]+([\d,]+\.?\d*)"
-        ]
-        
-        for pattern in fallback_patterns:
-            match = re.search(pattern, first_page_text, re.IGNORECASE)
+        for pattern in _TOTAL_FALLBACK_RES:
+            match = pattern.search(first_page_text)
             if match:
                 total_str = match.group(1).replace(',', '')
                 total = float(total_str)
-                logger.info(f"✅ Found Vodafone UK total (fallback): {total:,.2f}")
+                logger.info("✅ Found Vodafone UK total (fallback): %s", format(total, ',.2f'))
                 return total
         
         logger.warning("❌ Vodafone UK Invoice total not found")
         return 0.0
         
     except Exception as e:
-        logger.error(f"❌ Error extracting Vodafone UK invoice total: {e}")
+        logger.error("❌ Error extracting Vodafone UK invoice total: %s", e)
+        return 0.0
+
+# Backward compatibility: single-field entry points that open the PDF themselves
+def extract_invoice_id_from_first_page(pdf_path: str) -> str:
+    """Extract invoice ID from a Vodafone UK invoice PDF"""
+    try:
+        return extract_invoice_id_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for invoice ID: %s", e)
+        return None
+
+def extract_invoice_date_from_first_page(pdf_path: str) -> str:
+    """Extract invoice date from a Vodafone UK invoice PDF"""
+    try:
+        return extract_invoice_date_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for invoice date: %s", e)
+        return None
+
+def extract_ban_from_first_page(pdf_path: str) -> str:
+    """Extract BAN from a Vodafone UK invoice PDF"""
+    try:
+        return extract_ban_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for BAN: %s", e)
+        return None
+
+def extract_entity_name_from_registered_address(pdf_path: str) -> str:
+    """Extract entity name from a Vodafone UK invoice PDF"""
+    try:
+        return extract_entity_name_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for entity name: %s", e)
+        return None
+
+def extract_vendor_name_uk(pdf_path: str) -> str:
+    """Extract vendor name from a Vodafone UK invoice PDF"""
+    try:
+        return extract_vendor_name_uk_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for vendor name: %s", e)
+        return None
+
+def extract_invoice_total_from_first_page(pdf_path: str) -> float:
+    """Extract invoice total from a Vodafone UK invoice PDF"""
+    try:
+        return extract_invoice_total_from_text(_first_page_text(pdf_path))
+    except Exception as e:
+        logger.error("❌ Error reading Vodafone UK invoice for invoice total: %s", e)
         return 0.0
 
 # 3-STEP VALIDATION FUNCTIONS (same as PNG)
 
+def _ttl_bucket() -> int:
+    """Current cache window; changes every CATALOG_CACHE_TTL_SECONDS"""
+    return int(time.monotonic() // CATALOG_CACHE_TTL_SECONDS)
+
+def _session():
+    """This thread's Snowflake session, created on first use"""
+    if get_snowflake_session is None:
+        raise ImportError("config.snowflake_config is not available")
+    cached = getattr(_SESSION, 'session', None)
+    if cached is None or cached[0] != os.getpid():
+        cached = _SESSION.session = (os.getpid(), get_snowflake_session())
+    return cached[1]
+
+@functools.lru_cache(maxsize=1)
+def _load_entity_catalog(ttl_bucket: int) -> tuple:
+    """
+    Active ENTITY_CATALOG rows, loaded once per TTL window:
+    (rows as (entity_id, entity_name, clean_name, core_name, word_set),
+     first row index by clean name, first row index by core name)
+    """
+    session = _session()
+    
+    query = """
+        SELECT ENTITY_ID, ENTITY_NAME
+        FROM ENTITY_CATALOG
+        WHERE STATUS = 'Active'
+        ORDER BY ENTITY_NAME
+    """
+    
+    rows = []
+    by_clean = {}
+    by_core = {}
+    for row in session.sql(query).collect():
+        clean_name = clean_entity_name_for_matching(row[1])
+        core_name = extract_core_company_name(clean_name)
+        # setdefault keeps the first row in ENTITY_NAME order, as a linear scan would
+        by_clean.setdefault(clean_name, len(rows))
+        by_core.setdefault(core_name, len(rows))
+        rows.append((row[0], row[1], clean_name, core_name, frozenset(clean_name.split())))
+    return tuple(rows), by_clean, by_core
+
+@functools.lru_cache(maxsize=1)
+def _load_vendor_catalog(ttl_bucket: int) -> tuple:
+    """
+    Active VENDOR_CATALOG rows, loaded once per TTL window:
+    (rows as (vendor_name, normalized_name, currency),
+     first vendor name by normalized name, currency by vendor name)
+    """
+    session = _session()
+    
+    query = """
+        SELECT VENDOR_NAME, CURRENCY
+        FROM VENDOR_CATALOG
+        WHERE STATUS = 'Active'
+        ORDER BY VENDOR_NAME
+    """
+    
+    rows = tuple((row[0], normalize_vendor_name_for_matching(row[0]), row[1])
+                 for row in session.sql(query).collect())
+    by_normalized = {}
+    currencies = {}
+    for vendor_name, normalized_name, currency in rows:
+        by_normalized.setdefault(normalized_name, vendor_name)
+        if currency:
+            currencies.setdefault(vendor_name, currency)
+    return rows, by_normalized, currencies
+
+@functools.lru_cache(maxsize=1)
+def _load_entity_vendor_mapping(ttl_bucket: int) -> dict:
+    """Active ENTITY_VENDOR_MAPPING codes as {(entity_id, vendor_name): vendor_code}, loaded once per TTL window"""
+    session = _session()
+    
+    query = """
+        SELECT ENTITY_ID, VENDOR_NAME, ENTITY_VENDOR_CODE
+        FROM ENTITY_VENDOR_MAPPING
+        WHERE STATUS = 'Active'
+    """
+    
+    mapping = {}
+    for row in session.sql(query).collect():
+        if row[2]:
+            mapping.setdefault((row[0], row[1]), row[2])
+    return mapping
+
+def reset_catalog_cache():
+    """Drop the cached catalogs so the next lookup reloads them, e.g. after catalog edits"""
+    _load_entity_catalog.cache_clear()
+    _load_vendor_catalog.cache_clear()
+    _load_entity_vendor_mapping.cache_clear()
+
 def get_entity_id_from_catalog(entity_name: str) -> str:
     """Get Entity ID from ENTITY_CATALOG table by matching entity name - NO FALLBACKS"""
     try:
         if not entity_name:
             return None
             
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
         clean_extracted = clean_entity_name_for_matching(entity_name)
-        logger.info(f"   🔍 Matching Vodafone UK entity: '{entity_name}' (cleaned: '{clean_extracted}')")
-        
-        query = """
-            SELECT ENTITY_ID, ENTITY_NAME
-            FROM ENTITY_CATALOG
-            WHERE STATUS = 'Active'
-            ORDER BY ENTITY_NAME
-        """
+        logger.info("   🔍 Matching Vodafone UK entity: '%s' (cleaned: '%s')", entity_name, clean_extracted)
         
-        result = session.sql(query).collect()
+        # Catalog rows come cleaned, core-reduced and indexed from the cached load
+        result, by_clean, by_core = _load_entity_catalog(_ttl_bucket())
         if not result:
             logger.warning("   ⚠️ No active entities found in catalog")
             return None
         
-        # Try different matching strategies
-        for row in result:
-            catalog_entity_id = row[0]
-            catalog_entity_name = row[1]
-            clean_catalog = clean_entity_name_for_matching(catalog_entity_name)
-            
-            # Strategy 1: Exact match
-            if clean_extracted == clean_catalog:
-                logger.info(f"   ✅ Exact Vodafone UK match: '{entity_name}' → {catalog_entity_id} ({catalog_entity_name})")
-                return catalog_entity_id
-            
-            # Strategy 2: Core name match
-            extracted_core = extract_core_company_name(clean_extracted)
-            catalog_core = extract_core_company_name(clean_catalog)
-            
-            if extracted_core == catalog_core and len(extracted_core) > 3:
-                logger.info(f"   ✅ Core Vodafone UK match: '{entity_name}' → {catalog_entity_id} ({catalog_entity_name})")
-                return catalog_entity_id
+        extracted_core = extract_core_company_name(clean_extracted)
+        
+        # Strategy 1: Exact match / Strategy 2: Core name match
+        # Both are index lookups; as when scanning the rows in name order, the
+        # strategy that hits the earlier row wins (exact on the same row)
+        exact_idx = by_clean.get(clean_extracted)
+        core_idx = by_core.get(extracted_core) if len(extracted_core) > 3 else None
+        
+        if exact_idx is not None and (core_idx is None or exact_idx <= core_idx):
+            catalog_entity_id, catalog_entity_name = result[exact_idx][:2]
+            logger.info("   ✅ Exact Vodafone UK match: '%s' → %s (%s)", entity_name, catalog_entity_id, catalog_entity_name)
+            return catalog_entity_id
+        
+        if core_idx is not None:
+            catalog_entity_id, catalog_entity_name = result[core_idx][:2]
+            logger.info("   ✅ Core Vodafone UK match: '%s' → %s (%s)", entity_name, catalog_entity_id, catalog_entity_name)
+            return catalog_entity_id
         
         # Strategy 3: Fuzzy matching for partial matches
         best_match = find_best_fuzzy_match(clean_extracted, result)
         if best_match:
             entity_id, matched_name, similarity = best_match
-            logger.info(f"   ✅ Fuzzy Vodafone UK match ({similarity:.1%}): '{entity_name}' → {entity_id} ({matched_name})")
+            logger.info("   ✅ Fuzzy Vodafone UK match (%.1f%%): '%s' → %s (%s)", similarity * 100, entity_name, entity_id, matched_name)
             return entity_id
         
-        logger.warning(f"   ⚠️ No Vodafone UK entity match found for '{entity_name}' in ENTITY_CATALOG")
+        logger.warning("   ⚠️ No Vodafone UK entity match found for '%s' in ENTITY_CATALOG", entity_name)
         return None
         
     except Exception as e:
-        logger.error(f"   ❌ Error looking up Vodafone UK entity ID for '{entity_name}': {e}")
+        logger.error("   ❌ Error looking up Vodafone UK entity ID for '%s': %s", entity_name, e)
         return None
 
 def get_catalog_vendor_name(extracted_vendor_name: str) -> str:
     """Look up the extracted vendor name in the catalog and return the EXACT catalog version - NO FALLBACKS"""
     try:
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
+        logger.info("   🔍 Looking up vendor: '%s' in catalog...", extracted_vendor_name)
         
-        logger.info(f"   🔍 Looking up vendor: '{extracted_vendor_name}' in catalog...")
-        
-        query = """
-            SELECT VENDOR_NAME
-            FROM VENDOR_CATALOG
-            WHERE STATUS = 'Active'
-            ORDER BY VENDOR_NAME
-        """
-        
-        result = session.sql(query).collect()
+        result, by_normalized, _ = _load_vendor_catalog(_ttl_bucket())
         if not result:
             logger.warning("   ⚠️ No active vendors found in catalog")
             return extracted_vendor_name
         
         # Get the extracted vendor normalized for comparison
         extracted_normalized = normalize_vendor_name_for_matching(extracted_vendor_name)
-        logger.info(f"   🔍 Extracted normalized: '{extracted_normalized}'")
-        
-        # Find the matching catalog vendor and return its EXACT name
-        for row in result:
-            catalog_vendor_name = row[0]  # This is the EXACT name from catalog
-            catalog_normalized = normalize_vendor_name_for_matching(catalog_vendor_name)
-            
-            # If normalized versions match, return the EXACT catalog name
-            if extracted_normalized == catalog_normalized:
-                logger.info(f"   ✅ Vendor match found:")
-                logger.info(f"       Extracted: '{extracted_vendor_name}' → Normalized: '{extracted_normalized}'")
-                logger.info(f"       Catalog: '{catalog_vendor_name}' → Normalized: '{catalog_normalized}'")
-                logger.info(f"       Returning EXACT catalog name: '{catalog_vendor_name}'")
-                return catalog_vendor_name  # Return EXACT catalog name
-        
-        logger.warning(f"   ⚠️ No vendor match found for '{extracted_vendor_name}' in catalog")
+        logger.info("   🔍 Extracted normalized: '%s'", extracted_normalized)
+        
+        # Find the catalog vendor whose normalized name matches and return its EXACT name
+        catalog_vendor_name = by_normalized.get(extracted_normalized)
+        if catalog_vendor_name is not None:
+            logger.info("   ✅ Vendor match found:")
+            logger.info("       Extracted: '%s' → Normalized: '%s'", extracted_vendor_name, extracted_normalized)
+            logger.info("       Catalog: '%s' → Normalized: '%s'", catalog_vendor_name, extracted_normalized)
+            logger.info("       Returning EXACT catalog name: '%s'", catalog_vendor_name)
+            return catalog_vendor_name  # Return EXACT catalog name
+        
+        logger.warning("   ⚠️ No vendor match found for '%s' in catalog", extracted_vendor_name)
         return extracted_vendor_name
         
     except Exception as e:
-        logger.error(f"   ❌ Error looking up vendor in catalog: {e}")
+        logger.error("   ❌ Error looking up vendor in catalog: %s", e)
         return extracted_vendor_name
 
 def get_vendor_code_from_mapping(entity_id: str, vendor_name: str) -> str:
     """Get vendor code from ENTITY_VENDOR_MAPPING table - NO FALLBACKS"""
     try:
         if not entity_id or not vendor_name:
-            logger.warning(f"   ⚠️ Missing required data - Entity ID: {entity_id}, Vendor Name: {vendor_name}")
+            logger.warning("   ⚠️ Missing required data - Entity ID: %s, Vendor Name: %s", entity_id, vendor_name)
             return None
             
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
-        logger.info(f"   🔍 Mapping lookup: Entity '{entity_id}' + Vendor '{vendor_name}'")
-        
-        query = f"""
-            SELECT ENTITY_VENDOR_CODE
-            FROM ENTITY_VENDOR_MAPPING
-            WHERE ENTITY_ID = '{entity_id}' 
-            AND VENDOR_NAME = '{vendor_name.replace("'", "''")}' 
-            AND STATUS = 'Active'
-            LIMIT 1
-        """
-        
-        result = session.sql(query).collect()
-        if result and len(result) > 0 and result[0][0]:
-            vendor_code = result[0][0]
-            logger.info(f"   ✅ Found Entity-Vendor Code: {vendor_code}")
+        logger.info("   🔍 Mapping lookup: Entity '%s' + Vendor '%s'", entity_id, vendor_name)
+        
+        vendor_code = _load_entity_vendor_mapping(_ttl_bucket()).get((entity_id, vendor_name))
+        if vendor_code:
+            logger.info("   ✅ Found Entity-Vendor Code: %s", vendor_code)
             return vendor_code
         else:
-            logger.warning(f"   ⚠️ Entity-Vendor Code not found for Entity {entity_id} + {vendor_name}")
+            logger.warning("   ⚠️ Entity-Vendor Code not found for Entity %s + %s", entity_id, vendor_name)
             return None
             
     except Exception as e:
-        logger.error(f"   ❌ Error querying Entity-Vendor mapping: {e}")
+        logger.error("   ❌ Error querying Entity-Vendor mapping: %s", e)
         return None
 
 def get_vendor_currency(vendor_name: str) -> str:
     """Get currency from vendor catalog - NO FALLBACKS ALLOWED"""
     try:
-        from config.snowflake_config import get_snowflake_session
-        session = get_snowflake_session()
-        
-        query = f"""
-            SELECT CURRENCY
-            FROM VENDOR_CATALOG 
-            WHERE VENDOR_NAME = '{vendor_name.replace("'", "''")}' 
-            AND STATUS = 'Active'
-            LIMIT 1
-        """
-        
-        result = session.sql(query).collect()
-        if result and result[0][0]:
-            currency = result[0][0]
-            logger.info(f"   ✅ Found Vodafone UK currency from catalog: {currency}")
+        currency = _load_vendor_catalog(_ttl_bucket())[2].get(vendor_name)
+        if currency:
+            logger.info("   ✅ Found Vodafone UK currency from catalog: %s", currency)
             return currency
         else:
-            logger.warning(f"   ⚠️ Vendor '{vendor_name}' not found in VENDOR_CATALOG - NO FALLBACK")
+            logger.warning("   ⚠️ Vendor '%s' not found in VENDOR_CATALOG - NO FALLBACK", vendor_name)
             return None  # NO FALLBACKS - must come from catalog only
             
     except Exception as e:
-        logger.error(f"   ❌ Error looking up Vodafone UK vendor currency: {e}")
+        logger.error("   ❌ Error looking up Vodafone UK vendor currency: %s", e)
         return None  # NO FALLBACKS - must come from catalog only
 
 # UTILITY FUNCTIONS (same as PNG)
@@ -546,14 +722,12 @@ def clean_entity_name_for_matching(name: str) -> str:
     if not name:
         return ""
     
-    cleaned = name.upper().strip()
-    cleaned = cleaned.replace(',', '').replace('.', '').replace('-', ' ')
+    cleaned = name.upper().strip().translate(_PUNCT_TBL)
     cleaned = cleaned.replace(' LTD', ' LIMITED')
     cleaned = cleaned.replace(' CORP', ' CORPORATION')
     cleaned = cleaned.replace(' INC', ' INCORPORATED')
     
-    import re
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = _WS_RE.sub(' ', cleaned)
     
     return cleaned.strip()
 
@@ -562,82 +736,65 @@ def normalize_vendor_name_for_matching(name: str) -> str:
     if not name:
         return ""
     
-    cleaned = name.upper().strip()
-    cleaned = cleaned.replace(',', '').replace('.', '').replace('-', ' ')
-    
-    suffix_mappings = {
-        ' LIMITED': ' LTD',
-        ' INCORPORATED': ' INC', 
-        ' CORPORATION': ' CORP'
-    }
+    cleaned = name.upper().strip().translate(_PUNCT_TBL)
     
-    for full_suffix, short_suffix in suffix_mappings.items():
-        cleaned = cleaned.replace(full_suffix, short_suffix)
+    cleaned = _SUFFIX_LONG_FORM_RE.sub(lambda m: ' ' + _SUFFIX_SHORT_FORMS[m.group(1)], cleaned)
     
-    import re
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    cleaned = _WS_RE.sub(' ', cleaned)
     
     return cleaned.strip()
 
+@functools.lru_cache(maxsize=8192)
 def extract_core_company_name(name: str) -> str:
     """Extract core company name by removing ALL business suffixes"""
     if not name:
         return ""
     
-    suffixes = [
-        'INC', 'INCORPORATED', 'CORP', 'CORPORATION', 'LLC', 'LTD', 'LIMITED',
-        'CO', 'COMPANY', 'LP', 'LLP', 'PLLC', 'PC', 'ENTERPRISES', 'HOLDINGS',
-        'GROUP', 'INTERNATIONAL', 'INTL', 'TECHNOLOGIES', 'TECH', 'SYSTEMS',
-        'SOLUTIONS', 'SERVICES', 'COMMUNICATIONS', 'COMM', 'TELECOM', 'SA',
-        'PTE', 'PTY', 'BV', 'NV', 'SRL', 'SARL', 'GMBH', 'AG', 'AB', 'AS'
-    ]
-    
     words = name.split()
-    core_words = []
-    
-    for word in words:
-        if word not in suffixes:
-            core_words.append(word)
+    core_words = [word for word in words if word not in _BIZ_SUFFIXES]
     
     if not core_words and words:
         core_words = words[:1]
     
     return ' '.join(core_words)
 
-def calculate_phrase_similarity(name1: str, name2: str) -> float:
-    """Calculate similarity based on shared phrases/words"""
-    if not name1 or not name2:
-        return 0.0
-    
-    words1 = set([w for w in name1.split() if w])
-    words2 = set([w for w in name2.split() if w])
-    
-    if not words1 or not words2:
-        return 0.0
-    
-    common_words = words1.intersection(words2)
-    all_unique_words = words1.union(words2)
-    
-    return len(common_words) / len(all_unique_words)
-
-def find_best_fuzzy_match(target: str, catalog_results: list, min_similarity: float = 0.6) -> tuple:
-    """Find best fuzzy match using phrase-based similarity scoring"""
+def find_best_fuzzy_match(target: str, catalog_results: tuple, min_similarity: float = 0.6) -> tuple:
+    """
+    Find best fuzzy match using phrase-based similarity scoring
+    catalog_results are the rows loaded by _load_entity_catalog
+    """
     if not target or not catalog_results:
         return None
     
+    # Jaccard similarity of the word sets; the catalog's are built when it is loaded
+    target_words = frozenset(target.split())
+    if not target_words:
+        return None
+    target_len = len(target_words)
+    
     best_match = None
     best_similarity = 0.0
     
     for row in catalog_results:
-        catalog_entity_id = row[0]
-        catalog_entity_name = row[1]
-        clean_catalog = clean_entity_name_for_matching(catalog_entity_name)
+        words = row[4]
+        words_len = len(words)
+        if not words_len:
+            continue
+        
+        # Jaccard can't exceed the word-count ratio: skip rows that could
+        # neither reach min_similarity nor beat the current best
+        bound = min(target_len, words_len) / max(target_len, words_len)
+        if bound < min_similarity or bound <= best_similarity:
+            continue
         
-        similarity = calculate_phrase_similarity(target, clean_catalog)
+        common = len(target_words & words)
+        similarity = common / (target_len + words_len - common)
         
         if similarity > best_similarity and similarity >= min_similarity:
             best_similarity = similarity
-            best_match = (catalog_entity_id, catalog_entity_name, similarity)
+            best_match = (row[0], row[1], similarity)
+            if similarity == 1.0:
+                break  # nothing can beat an exact word-set match
     
     return best_match
 
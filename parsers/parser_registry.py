@@ -5,86 +5,151 @@ Handles both header and detail parsers for multiple vendors and regional variant
 """
 
 import importlib
+import importlib.util
+import logging
 import os
 import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Callable, Tuple
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Resolved parser functions, keyed by ('header', vendor) or ('detail', vendor, vendor_name).
+# Checked before any config lookup so repeat calls for a vendor cost one dict lookup.
+_PARSER_CACHE: Dict[tuple, Callable] = {}
+
+# Most recent vendor detections kept per registry; older entries are evicted first
+DETECT_VENDOR_CACHE_SIZE = 4096
+
+# Vendor detection patterns (from filename or content). Module-level and read-only, so every
+# registry instance shares them and the regexes below are compiled once at import.
+_VENDOR_PATTERNS = MappingProxyType({
+    'equinix': MappingProxyType({
+        'filename_patterns': (r'\.equinix\.', r'equinix'),
+        'content_patterns': ('Equinix', 'IBX'),
+        'header_parser': 'parsers.headers.equinix_header'
+    }),
+    'lumen': MappingProxyType({
+        'filename_patterns': (
+            r'\.lumen\.', r'lumen', r'level3',
+            r'\.centurylink\.', r'centurylink', r'\.smb'
+        ),
+        'content_patterns': ('Lumen', 'Level 3', 'Lumen Technologies'),
+        'header_parser': 'parsers.headers.lumen_header'
+    }),
+    'digital_realty': MappingProxyType({
+        'filename_patterns': (r'\.digitalrealty\.', r'digitalrealty', r'\.interxion\.', r'interxion'),
+        'content_patterns': ('Digital London Ltd.', 'Teik - New York, LLC', 'Digital Realty', 'Interxion'),
+        'header_parser': 'parsers.headers.digital_realty_header'
+    }),
+    
+    # UPDATED: Vodafone with multi-branch support
+    'vodafone': MappingProxyType({
+        'filename_patterns': (
+            r'\.vodafone\.', r'vodafone', r'\.voda\.', r'voda'
+        ),
+        'content_patterns': (
+            'Vodafone', 'Vodafone Business', 'Your registered address:', 
+            'Your invoice number'
+        ),
+        'header_parser': 'parsers.headers.vodafone_header'  # Will create router
+    }),
+    
+    'att': MappingProxyType({
+        'filename_patterns': (r'\.att\.', r'att'),
+        'content_patterns': ('AT&T', 'ATT'),
+        'header_parser': 'parsers.headers.att_header'
+    })
+})
+
+# Detail parser mapping: vendor → regional variant → parser module
+_DETAIL_PARSER_MAPPING = MappingProxyType({
+    # Equinix regional variants
+    'equinix': MappingProxyType({
+        'Equinix, Inc': 'parsers.details.equinix_usglobe_detail',  # Globe format (replaces equinix_usa_detail)
+        'Equinix (Germany) GmbH': 'parsers.details.equinix_germany_detail',
+        'Equinix Singapore Pte. Ltd.': 'parsers.details.equinix_singapore_detail',
+        'Equinix Japan K.K.': 'parsers.details.equinix_japan_detail',
+        'Equinix Australia Pty Ltd': 'parsers.details.equinix_australia_detail',
+        'Equinix Middle East FZ-LLC': 'parsers.details.equinix_middle_east_detail',
+    }),
+    
+    # Lumen variants - same detail parser, different vendor names
+    'lumen': MappingProxyType({
+        'Lumen Technologies': 'parsers.details.lumen_detail',
+        'Level 3 Communications': 'parsers.details.lumen_detail',
+        'Lumen Technologies NL BV': 'parsers.details.lumen_netherlands_detail',  # Netherlands variant
+    }),
+    
+    # Digital Realty variants
+    'digital_realty': MappingProxyType({
+        'Digital London Ltd.': 'parsers.details.digital_realty_uk_detail',
+        'Telx - New York, LLC': 'parsers.details.digital_realty_usa_detail',
+    }),
+    
+    # UPDATED: Vodafone variants with branch-specific parsers - FIXED VENDOR NAMES
+    'vodafone': MappingProxyType({
+        'Vodafone Limited': 'parsers.details.vodafone_uk_detail',
+        'Vodafone PNG Ltd': 'parsers.details.vodafone_png_detail',  # FIXED: Match catalog name
+    }),
+    
+    # AT&T (may have regional variants)
+    'att': MappingProxyType({
+        'AT&T': 'parsers.details.att_detail',
+    }),
+})
+
+# One alternation per vendor, so detection runs a single regex per vendor
+# instead of one re.search per pattern
+_FILENAME_RES = MappingProxyType({
+    vendor: re.compile('|'.join(f'(?:{p})' for p in patterns['filename_patterns']), re.IGNORECASE)
+    for vendor, patterns in _VENDOR_PATTERNS.items()
+})
+
+# Content patterns are plain literals: lowercase them once and test them with
+# substring checks against a sample lowered once per call, which is much
+# cheaper than a case-insensitive regex over a full page of text
+_CONTENT_LITERALS = MappingProxyType({
+    vendor: tuple(p.lower() for p in patterns['content_patterns'])
+    for vendor, patterns in _VENDOR_PATTERNS.items()
+})
+
+# The same literals flattened in vendor order, for mapping a catalog vendor name
+# back to its vendor key
+_CONTENT_PATTERN_VENDORS = tuple(
+    (pattern, vendor)
+    for vendor, literals in _CONTENT_LITERALS.items()
+    for pattern in literals
+)
+
 class MultiVendorParserRegistry:
     """Registry to manage and route to different vendor and regional parsers"""
     
     def __init__(self):
-        # Vendor detection patterns (from filename or content)
-        self.vendor_detection_patterns = {
-            'equinix': {
-                'filename_patterns': [r'\.equinix\.', r'equinix'],
-                'content_patterns': ['Equinix', 'IBX'],
-                'header_parser': 'parsers.headers.equinix_header'
-            },
-            'lumen': {
-                'filename_patterns': [
-                    r'\.lumen\.', r'lumen', r'level3',
-                    r'\.centurylink\.', r'centurylink', r'\.smb'
-                ],
-                'content_patterns': ['Lumen', 'Level 3', 'Lumen Technologies'],
-                'header_parser': 'parsers.headers.lumen_header'
-            },
-            'digital_realty': {
-                'filename_patterns': [r'\.digitalrealty\.', r'digitalrealty', r'\.interxion\.', r'interxion'],
-                'content_patterns': ['Digital London Ltd.', 'Teik - New York, LLC', 'Digital Realty', 'Interxion'],
-                'header_parser': 'parsers.headers.digital_realty_header'
-            },
-            
-            # UPDATED: Vodafone with multi-branch support
-            'vodafone': {
-                'filename_patterns': [
-                    r'\.vodafone\.', r'vodafone', r'\.voda\.', r'voda'
-                ],
-                'content_patterns': [
-                    'Vodafone', 'Vodafone Business', 'Your registered address:', 
-                    'Your invoice number'
-                ],
-                'header_parser': 'parsers.headers.vodafone_header'  # Will create router
-            },
-            
-            'att': {
-                'filename_patterns': [r'\.att\.', r'att'],
-                'content_patterns': ['AT&T', 'ATT'],
-                'header_parser': 'parsers.headers.att_header'
-            }
-        }
+        # Shared, read-only configuration and its precompiled forms (built once at import)
+        self.vendor_detection_patterns = _VENDOR_PATTERNS
+        self.detail_parser_mapping = _DETAIL_PARSER_MAPPING
+        self._filename_res = _FILENAME_RES
+        self._content_literals = _CONTENT_LITERALS
+        self._content_pattern_vendors = _CONTENT_PATTERN_VENDORS
         
-        # Detail parser mapping: vendor + regional variant → parser module
-        self.detail_parser_mapping = {
-            # Equinix regional variants
-            ('equinix', 'Equinix, Inc'): 'parsers.details.equinix_usa_detail',
-            ('equinix', 'Equinix (Germany) GmbH'): 'parsers.details.equinix_germany_detail',
-            ('equinix', 'Equinix Singapore Pte. Ltd.'): 'parsers.details.equinix_singapore_detail',
-            ('equinix', 'Equinix Japan K.K.'): 'parsers.details.equinix_japan_detail',
-            ('equinix', 'Equinix Australia Pty Ltd'): 'parsers.details.equinix_australia_detail',
-            ('equinix', 'Equinix Middle East FZ-LLC'): 'parsers.details.equinix_middle_east_detail',
-            ('equinix', 'Equinix, Inc'): 'parsers.details.equinix_usglobe_detail',  # Override for Globe format
-            
-            # Lumen variants - same detail parser, different vendor names
-            ('lumen', 'Lumen Technologies'): 'parsers.details.lumen_detail',
-            ('lumen', 'Level 3 Communications'): 'parsers.details.lumen_detail',
-            ('lumen', 'Lumen Technologies NL BV'): 'parsers.details.lumen_netherlands_detail',  # Netherlands variant            
-            
-            # Digital Realty variants
-            ('digital_realty', 'Digital London Ltd.'): 'parsers.details.digital_realty_uk_detail',
-            ('digital_realty', 'Telx - New York, LLC'): 'parsers.details.digital_realty_usa_detail',
-            
-            # UPDATED: Vodafone variants with branch-specific parsers - FIXED VENDOR NAMES
-            ('vodafone', 'Vodafone Limited'): 'parsers.details.vodafone_uk_detail',
-            ('vodafone', 'Vodafone PNG Ltd'): 'parsers.details.vodafone_png_detail',  # FIXED: Match catalog name
-            
-            # AT&T (may have regional variants)
-            ('att', 'AT&T'): 'parsers.details.att_detail',
-        }
+        # Catalog vendor name -> vendor key, memoized by _vendor_key_for_name
+        self._vendor_key_by_name = {}
         
         # Cache loaded modules to avoid repeated imports
         self._loaded_header_parsers = {}
         self._loaded_detail_parsers = {}
+        
+        # (filename, content sample) -> detected vendor, LRU-ordered.
+        # The validator, header and detail steps each detect the same file.
+        self._vendor_cache = OrderedDict()
+        self._vendor_cache_lock = threading.Lock()
+        
+        # Parser module name -> "AVAILABLE" / "MISSING", for get_registry_status
+        self._module_status_cache = {}
     
     def detect_vendor(self, pdf_path: str, content_sample: str = None) -> Optional[str]:
         """
@@ -97,23 +162,43 @@ class MultiVendorParserRegistry:
         Returns:
             Vendor key or None if not detected
         """
-        filename = os.path.basename(pdf_path).lower()
+        # The filename regexes are case-insensitive, so the name is matched as-is
+        filename = os.path.basename(pdf_path)
         
-        for vendor, patterns in self.vendor_detection_patterns.items():
+        # Detection only depends on the filename and sample, so no mtime is needed in the key.
+        # The sample itself is keyed, not its hash, so colliding samples can't share a result.
+        cache_key = (filename, content_sample or None)
+        with self._vendor_cache_lock:
+            if cache_key in self._vendor_cache:
+                self._vendor_cache.move_to_end(cache_key)
+                return self._vendor_cache[cache_key]
+        
+        vendor = self._match_vendor(filename, content_sample)
+        with self._vendor_cache_lock:
+            self._vendor_cache[cache_key] = vendor
+            if len(self._vendor_cache) > DETECT_VENDOR_CACHE_SIZE:
+                self._vendor_cache.popitem(last=False)
+        return vendor
+    
+    def _match_vendor(self, filename: str, content_sample: str = None) -> Optional[str]:
+        """Run the vendor detection patterns against a filename and optional content"""
+        content_lower = content_sample.lower() if content_sample else None
+        
+        for vendor in self.vendor_detection_patterns:
             # Check filename patterns
-            for pattern in patterns['filename_patterns']:
-                if re.search(pattern, filename):
-                    print(f"🔍 Detected vendor '{vendor}' from filename pattern: {pattern}")
-                    return vendor
+            match = self._filename_res[vendor].search(filename)
+            if match:
+                logger.debug("🔍 Detected vendor '%s' from filename pattern match: %s", vendor, match.group(0))
+                return vendor
             
             # Check content patterns if available
-            if content_sample:
-                for pattern in patterns['content_patterns']:
-                    if pattern.lower() in content_sample.lower():
-                        print(f"🔍 Detected vendor '{vendor}' from content pattern: {pattern}")
+            if content_lower:
+                for pattern in self._content_literals[vendor]:
+                    if pattern in content_lower:
+                        logger.debug("🔍 Detected vendor '%s' from content pattern: %s", vendor, pattern)
                         return vendor
         
-        print(f"⚠️ Could not detect vendor from: {filename}")
+        logger.warning("⚠️ Could not detect vendor from: %s", filename)
         return None
     
     def get_header_parser(self, vendor: str) -> Optional[Callable]:
@@ -126,20 +211,26 @@ class MultiVendorParserRegistry:
         Returns:
             Header parser function or None
         """
+        parser_func = _PARSER_CACHE.get(('header', vendor))
+        if parser_func is not None:
+            return parser_func
+        
         try:
             vendor_config = self.vendor_detection_patterns.get(vendor)
             if not vendor_config:
-                print(f"⚠️ No configuration found for vendor: {vendor}")
+                logger.warning("⚠️ No configuration found for vendor: %s", vendor)
                 return None
             
             module_name = vendor_config['header_parser']
             
             # Check if already loaded
             if module_name in self._loaded_header_parsers:
-                return self._loaded_header_parsers[module_name]
+                parser_func = self._loaded_header_parsers[module_name]
+                _PARSER_CACHE[('header', vendor)] = parser_func
+                return parser_func
             
             # Dynamically import the header parser
-            print(f"📦 Loading header parser: {module_name}")
+            logger.debug("📦 Loading header parser: %s", module_name)
             module = importlib.import_module(module_name)
             
             # Get the extract function (standardized name)
@@ -148,18 +239,19 @@ class MultiVendorParserRegistry:
             elif hasattr(module, 'extract_equinix_header'):  # Backward compatibility
                 parser_func = module.extract_equinix_header
             else:
-                print(f"❌ Header parser module {module_name} missing standard extract function")
+                logger.error("❌ Header parser module %s missing standard extract function", module_name)
                 return None
             
             self._loaded_header_parsers[module_name] = parser_func
-            print(f"✅ Loaded header parser for: {vendor}")
+            _PARSER_CACHE[('header', vendor)] = parser_func
+            logger.info("✅ Loaded header parser for: %s", vendor)
             return parser_func
             
         except ImportError as e:
-            print(f"❌ Failed to import header parser for {vendor}: {e}")
+            logger.error("❌ Failed to import header parser for %s: %s", vendor, e)
             return None
         except Exception as e:
-            print(f"❌ Error loading header parser for {vendor}: {e}")
+            logger.error("❌ Error loading header parser for %s: %s", vendor, e)
             return None
 
 
@@ -167,49 +259,55 @@ class MultiVendorParserRegistry:
         """
         Get detail parser for a vendor and regional variant
         """
+        parser_func = _PARSER_CACHE.get(('detail', vendor, vendor_name))
+        if parser_func is not None:
+            return parser_func
+        
         try:
             # Look for exact match first
-            parser_key = (vendor, vendor_name)
-            module_name = self.detail_parser_mapping.get(parser_key)
+            vendor_variants = self.detail_parser_mapping.get(vendor, {})
+            module_name = vendor_variants.get(vendor_name)
             
-            print(f"🔍 Looking for parser_key: {parser_key}")
-            print(f"🔍 Found module_name: {module_name}")
+            logger.debug("🔍 Looking for parser_key: %s", (vendor, vendor_name))
+            logger.debug("🔍 Found module_name: %s", module_name)
             
             if not module_name:
-                print(f"⚠️ No detail parser found for vendor: {vendor}, variant: {vendor_name}")
-                print(f"🔍 Available mappings:")
-                for key in self.detail_parser_mapping.keys():
-                    if key[0] == vendor:
-                        print(f"    {key}")
+                logger.warning("⚠️ No detail parser found for vendor: %s, variant: %s", vendor, vendor_name)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔍 Available mappings for %s: %s", vendor, list(vendor_variants))
                 return None
             
             # Check if already loaded
             if module_name in self._loaded_detail_parsers:
-                print(f"✅ Using cached parser: {module_name}")
-                return self._loaded_detail_parsers[module_name]
+                logger.debug("✅ Using cached parser: %s", module_name)
+                parser_func = self._loaded_detail_parsers[module_name]
+                _PARSER_CACHE[('detail', vendor, vendor_name)] = parser_func
+                return parser_func
             
             # Dynamically import the detail parser
-            print(f"📦 Loading detail parser: {module_name}")
+            logger.debug("📦 Loading detail parser: %s", module_name)
             module = importlib.import_module(module_name)
-            print(f"✅ Module imported successfully: {module}")
+            logger.debug("✅ Module imported successfully: %s", module)
             
             # Get the extract function (standardized name)
             if hasattr(module, 'extract_equinix_items'):
                 parser_func = module.extract_equinix_items
-                print(f"✅ Found extract_equinix_items function: {parser_func}")
+                logger.debug("✅ Found extract_equinix_items function: %s", parser_func)
                 self._loaded_detail_parsers[module_name] = parser_func
-                print(f"✅ Loaded detail parser for: {vendor} - {vendor_name}")
+                _PARSER_CACHE[('detail', vendor, vendor_name)] = parser_func
+                logger.info("✅ Loaded detail parser for: %s - %s", vendor, vendor_name)
                 return parser_func
             else:
-                print(f"❌ Detail parser module {module_name} missing extract_equinix_items function")
-                print(f"🔍 Available functions: {[attr for attr in dir(module) if not attr.startswith('_')]}")
+                logger.error("❌ Detail parser module %s missing extract_equinix_items function", module_name)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔍 Available functions: %s", [attr for attr in dir(module) if not attr.startswith('_')])
                 return None
                 
         except ImportError as e:
-            print(f"❌ Failed to import detail parser for {vendor} - {vendor_name}: {e}")
+            logger.error("❌ Failed to import detail parser for %s - %s: %s", vendor, vendor_name, e)
             return None
         except Exception as e:
-            print(f"❌ Error loading detail parser for {vendor} - {vendor_name}: {e}")
+            logger.error("❌ Error loading detail parser for %s - %s: %s", vendor, vendor_name, e)
             return None
 
    
@@ -228,59 +326,65 @@ class MultiVendorParserRegistry:
         if not vendor:
             vendor = self.detect_vendor(pdf_path)
             if not vendor:
-                print(f"❌ Cannot determine vendor for: {pdf_path}")
+                logger.error("❌ Cannot determine vendor for: %s", pdf_path)
                 return pd.DataFrame()
         
         # Get and use header parser
         header_parser = self.get_header_parser(vendor)
         if header_parser:
-            print(f"🎯 Using header parser for vendor: {vendor}")
+            logger.debug("🎯 Using header parser for vendor: %s", vendor)
             return header_parser(pdf_path)
         else:
-            print(f"❌ No header parser available for vendor: {vendor}")
+            logger.error("❌ No header parser available for vendor: %s", vendor)
             return pd.DataFrame()
     
-    def extract_details(self, pdf_path: str, header_data: Dict[str, Any]) -> pd.DataFrame:
+    def extract_details(self, pdf_path: str, header_data: Dict[str, Any], vendor_key: str = None) -> pd.DataFrame:
         """
         Extract details using appropriate vendor and regional parser
         
         Args:
             pdf_path: Path to PDF invoice
             header_data: Header context data with vendor information
+            vendor_key: Vendor key already resolved for the header (optional, skips re-detection)
             
         Returns:
             DataFrame with detail line items
         """
         # Determine vendor from header data or filename
         vendor_name = header_data.get('vendor', 'UNKNOWN')
+        vendor = vendor_key
         
         # Map vendor name back to vendor key
-        vendor = None
-        for v, config in self.vendor_detection_patterns.items():
-            for pattern in config['content_patterns']:
-                if pattern.lower() in vendor_name.lower():
-                    vendor = v
-                    break
-            if vendor:
-                break
+        if not vendor:
+            vendor = self._vendor_key_for_name(vendor_name)
         
         # Fallback to filename detection
         if not vendor:
             vendor = self.detect_vendor(pdf_path)
         
         if not vendor:
-            print(f"❌ Cannot determine vendor for detail extraction: {vendor_name}")
+            logger.error("❌ Cannot determine vendor for detail extraction: %s", vendor_name)
             return pd.DataFrame()
         
         # Get and use detail parser
         detail_parser = self.get_detail_parser(vendor, vendor_name)
         if detail_parser:
-            print(f"🎯 Using detail parser for vendor: {vendor} - {vendor_name}")
+            logger.debug("🎯 Using detail parser for vendor: %s - %s", vendor, vendor_name)
             return detail_parser(pdf_path, header_data)
         else:
-            print(f"❌ No detail parser available for vendor: {vendor} - {vendor_name}")
+            logger.error("❌ No detail parser available for vendor: %s - %s", vendor, vendor_name)
             return pd.DataFrame()
     
+    def _vendor_key_for_name(self, vendor_name: str) -> Optional[str]:
+        """Vendor key whose content patterns appear in a vendor name (first vendor wins), memoized"""
+        if vendor_name in self._vendor_key_by_name:
+            return self._vendor_key_by_name[vendor_name]
+        
+        vendor_name_lower = vendor_name.lower()
+        vendor = next((v for pattern, v in self._content_pattern_vendors if pattern in vendor_name_lower), None)
+        self._vendor_key_by_name[vendor_name] = vendor
+        return vendor
+    
     def process_complete_invoice(self, pdf_path: str, vendor: str = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Complete invoice processing: header + details
@@ -292,17 +396,21 @@ class MultiVendorParserRegistry:
         Returns:
             Tuple of (header_df, detail_df)
         """
-        print(f"🔄 Processing complete invoice: {os.path.basename(pdf_path)}")
+        logger.info("🔄 Processing complete invoice: %s", os.path.basename(pdf_path))
+        
+        # Resolve the vendor once and reuse it for both header and details
+        if not vendor:
+            vendor = self.detect_vendor(pdf_path)
         
         # Extract header
         header_df = self.extract_header(pdf_path, vendor)
         if header_df.empty:
-            print("❌ Header extraction failed")
+            logger.error("❌ Header extraction failed")
             return pd.DataFrame(), pd.DataFrame()
         
         # Extract details
         header_data = header_df.iloc[0].to_dict()
-        detail_df = self.extract_details(pdf_path, header_data)
+        detail_df = self.extract_details(pdf_path, header_data, vendor_key=vendor)
         
         return header_df, detail_df
     
@@ -321,49 +429,76 @@ class MultiVendorParserRegistry:
         # Check header parser status
         for vendor, config in self.vendor_detection_patterns.items():
             module_name = config['header_parser']
-            try:
-                importlib.import_module(module_name)
-                status['header_parsers'][vendor] = "AVAILABLE"
-            except ImportError:
-                status['header_parsers'][vendor] = "MISSING"
+            status['header_parsers'][vendor] = self._module_status(module_name)
         
         # Check detail parser status  
-        for (vendor, variant), module_name in self.detail_parser_mapping.items():
-            key = f"{vendor}_{variant.replace(' ', '_').replace('.', '').replace(',', '')}"
-            try:
-                importlib.import_module(module_name)
-                status['detail_parsers'][key] = "AVAILABLE"
-            except ImportError:
-                status['detail_parsers'][key] = "MISSING"
+        for vendor, variants in self.detail_parser_mapping.items():
+            for variant, module_name in variants.items():
+                key = f"{vendor}_{variant.replace(' ', '_').replace('.', '').replace(',', '')}"
+                status['detail_parsers'][key] = self._module_status(module_name)
         
         return status
+    
+    def _module_status(self, module_name: str) -> str:
+        """
+        AVAILABLE if the parser module can be found, else MISSING.
+        Uses find_spec so no parser code runs just to check it exists; cached per module.
+        """
+        if module_name not in self._module_status_cache:
+            try:
+                found = importlib.util.find_spec(module_name) is not None
+            except (ImportError, ValueError):  # e.g. a parent package that fails to import
+                found = False
+            self._module_status_cache[module_name] = "AVAILABLE" if found else "MISSING"
+        return self._module_status_cache[module_name]
+
+# Global registry instance, created on first use (PEP 562 module __getattr__ below).
+# Once created it lives in the module globals, so later `registry` lookups skip __getattr__.
+def _get_registry() -> MultiVendorParserRegistry:
+    """Return the shared registry, creating it on first call"""
+    instance = globals().get('registry')
+    if instance is None:
+        instance = globals()['registry'] = MultiVendorParserRegistry()
+    return instance
 
-# Global registry instance
-registry = MultiVendorParserRegistry()
+def __getattr__(name: str):
+    if name == 'registry':
+        return _get_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions for direct use
 def extract_header(pdf_path: str, vendor: str = None) -> pd.DataFrame:
     """Extract header using appropriate vendor parser"""
-    return registry.extract_header(pdf_path, vendor)
+    return _get_registry().extract_header(pdf_path, vendor)
 
-def extract_details(pdf_path: str, header_data: Dict[str, Any]) -> pd.DataFrame:
+def extract_details(pdf_path: str, header_data: Dict[str, Any], vendor_key: str = None) -> pd.DataFrame:
     """Extract details using appropriate vendor and regional parser"""
-    return registry.extract_details(pdf_path, header_data)
+    return _get_registry().extract_details(pdf_path, header_data, vendor_key)
 
 def process_complete_invoice(pdf_path: str, vendor: str = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Process complete invoice: header + details"""
-    return registry.process_complete_invoice(pdf_path, vendor)
+    return _get_registry().process_complete_invoice(pdf_path, vendor)
+
+def get_header_parser(vendor: str) -> Optional[Callable]:
+    """Get header parser for a vendor, straight from the parser cache once resolved"""
+    return _PARSER_CACHE.get(('header', vendor)) or _get_registry().get_header_parser(vendor)
+
+def get_detail_parser(vendor: str, vendor_name: str) -> Optional[Callable]:
+    """Get detail parser for a vendor and regional variant, straight from the parser cache once resolved"""
+    return _PARSER_CACHE.get(('detail', vendor, vendor_name)) or _get_registry().get_detail_parser(vendor, vendor_name)
 
 def get_supported_vendors() -> list:
     """Get list of supported vendors"""
-    return list(registry.vendor_detection_patterns.keys())
+    return list(_VENDOR_PATTERNS.keys())
 
 def get_registry_status() -> Dict[str, Any]:
     """Get comprehensive registry status"""
-    return registry.get_registry_status()
+    return _get_registry().get_registry_status()
 
 # For testing and debugging
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     print("🧪 Testing Enhanced Multi-Vendor Parser Registry")
     print("=" * 60)
     
@@ -396,5 +531,5 @@ if __name__ == "__main__":
     ]
     
     for test_file in test_files:
-        vendor = registry.detect_vendor(test_file)
+        vendor = _get_registry().detect_vendor(test_file)
         print(f"  {test_file} → {vendor}")
\ No newline at end of file
@@ -5,11 +5,22 @@ Validates all invoices in folder before processing and generates reports
 """
 
 import os
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from enhanced_provider_detection import EnhancedProviderDetection
 from typing import List, Dict
 import json
+import xlsxwriter
+
+# Folders with fewer PDFs than this are validated in-process; process start-up isn't worth it
+VALIDATION_POOL_MIN_FILES = 4
+
+# Validation status labels, indexed by severity rank
+_STATUS_BY_RANK = ("✅ READY", "⚠️ ATTENTION", "❌ FAILED")
+
+# Column headers of the detailed Excel report
+_REPORT_COLUMNS = ('Filename', 'Status', 'Entity_ID', 'Vendor_Code', 'Vendor_Name', 'Currency',
+                   'Detected_Entity', 'Detected_Vendor', 'Issues')
 
 class PreProcessingValidator:
     
@@ -29,7 +40,12 @@ class PreProcessingValidator:
         if not os.path.exists(self.invoice_folder):
             return {"error": f"Invoice folder '{self.invoice_folder}' not found"}
         
-        pdf_files = [f for f in os.listdir(self.invoice_folder) if f.lower().endswith('.pdf')]
+        # One scandir pass; DirEntry.is_file() uses the type cached from the directory listing
+        with os.scandir(self.invoice_folder) as entries:
+            pdf_files = sorted(
+                (entry for entry in entries if entry.is_file() and entry.name.lower().endswith('.pdf')),
+                key=lambda entry: entry.name
+            )
         
         if not pdf_files:
             return {"error": f"No PDF files found in '{self.invoice_folder}'"}
@@ -46,9 +62,18 @@ class PreProcessingValidator:
             "details": []
         }
         
-        for filename in sorted(pdf_files):
-            filepath = os.path.join(self.invoice_folder, filename)
-            result = self._validate_single_invoice(filepath)
+        filepaths = [entry.path for entry in pdf_files]
+        
+        # Each invoice is independent (PDF parsing + catalog lookups), so larger folders
+        # are spread across processes; map() keeps the results in filename order
+        if len(filepaths) < VALIDATION_POOL_MIN_FILES:
+            results = [self._validate_single_invoice(filepath) for filepath in filepaths]
+        else:
+            workers = min(os.cpu_count() or 1, len(filepaths))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._validate_single_invoice, filepaths))
+        
+        for result in results:
             summary["details"].append(result)
             
             # Update counters
@@ -74,41 +99,44 @@ class PreProcessingValidator:
             # Get identification context
             context = self.detector.detect_full_context_with_database(filepath)
             
-            # Determine status
-            status = "✅ READY"
+            entity_info = context['entity_info']
+            vendor_info = context['vendor_info']
+            detected_entity = context['detected_entity']
+            header = context['header_enrichment']
+            
+            # Determine status: rank only ever rises (READY → ATTENTION → FAILED)
+            status_rank = 0
             issues = []
             
-            if not context['entity_info']:
+            if not entity_info:
                 issues.append("Entity not identified or not found in database")
-                status = "❌ FAILED"
+                status_rank = 2
             
-            if not context['vendor_info']:
+            if not vendor_info:
                 issues.append("Vendor not identified or not found in database")
-                status = "❌ FAILED"
+                status_rank = 2
             
             if not context['entity_vendor_code']:
                 issues.append("Entity-vendor mapping not found")
-                status = "❌ FAILED"
+                status_rank = 2
             
             # Check for partial matches (might need attention)
-            if context['entity_info'] and context['entity_info'].get('match_type') == 'partial':
-                issues.append(f"Entity matched partially: '{context['detected_entity']['entity_name']}' → '{context['entity_info']['entity_name']}'")
-                if status == "✅ READY":
-                    status = "⚠️ ATTENTION"
+            if entity_info and entity_info.get('match_type') == 'partial':
+                issues.append(f"Entity matched partially: '{detected_entity['entity_name']}' → '{entity_info['entity_name']}'")
+                status_rank = max(status_rank, 1)
             
-            if context['vendor_info'] and context['vendor_info'].get('match_type') == 'partial':
+            if vendor_info and vendor_info.get('match_type') == 'partial':
                 issues.append(f"Vendor matched partially")
-                if status == "✅ READY":
-                    status = "⚠️ ATTENTION"
+                status_rank = max(status_rank, 1)
             
             return {
                 "filename": filename,
-                "status": status,
-                "entity_id": context['header_enrichment']['invoiced_bu'],
-                "vendor_code": context['header_enrichment']['vendor_code'],
-                "vendor_name": context['header_enrichment']['vendor_name'],
-                "currency": context['header_enrichment']['currency'],
-                "detected_entity": context['detected_entity']['entity_name'] if context['detected_entity'] else None,
+                "status": _STATUS_BY_RANK[status_rank],
+                "entity_id": header['invoiced_bu'],
+                "vendor_code": header['vendor_code'],
+                "vendor_name": header['vendor_name'],
+                "currency": header['currency'],
+                "detected_entity": detected_entity['entity_name'] if detected_entity else None,
                 "detected_vendor": context['vendor_variant'],
                 "issues": issues,
                 "context": context
@@ -161,28 +189,32 @@ class PreProcessingValidator:
     def _generate_detailed_report(self, summary: Dict):
         """Generate detailed Excel report"""
         try:
-            # Prepare data for Excel
-            report_data = []
-            for detail in summary['details']:
-                report_data.append({
-                    'Filename': detail['filename'],
-                    'Status': detail['status'],
-                    'Entity_ID': detail['entity_id'],
-                    'Vendor_Code': detail['vendor_code'],
-                    'Vendor_Name': detail['vendor_name'],
-                    'Currency': detail['currency'],
-                    'Detected_Entity': detail['detected_entity'],
-                    'Detected_Vendor': detail['detected_vendor'],
-                    'Issues': '; '.join(detail['issues']) if detail['issues'] else 'None'
-                })
-            
-            # Create DataFrame and save
-            df = pd.DataFrame(report_data)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"reports/invoice_validation_{timestamp}.xlsx"
             
             os.makedirs('reports', exist_ok=True)
-            df.to_excel(filename, index=False, sheet_name='Validation Results')
+            # constant_memory streams each row to disk as it is written, so rows must be
+            # written in order, one write_row() per row
+            workbook = xlsxwriter.Workbook(filename, {'constant_memory': True})
+            try:
+                worksheet = workbook.add_worksheet('Validation Results')
+                header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+                worksheet.write_row(0, 0, _REPORT_COLUMNS, header_format)
+                
+                for i, detail in enumerate(summary['details'], start=1):
+                    worksheet.write_row(i, 0, [
+                        detail['filename'],
+                        detail['status'],
+                        detail['entity_id'],
+                        detail['vendor_code'],
+                        detail['vendor_name'],
+                        detail['currency'],
+                        detail['detected_entity'],
+                        detail['detected_vendor'],
+                        '; '.join(detail['issues']) if detail['issues'] else 'None'
+                    ])
+            finally:
+                workbook.close()
             
             print(f"📄 Detailed report saved: {filename}")
             
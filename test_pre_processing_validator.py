@@ -0,0 +1,75 @@
+# test_pre_processing_validator.py
+"""
+Test the detailed Excel validation report
+Writes a report for a synthetic summary, reads it back and checks every cell
+"""
+
+import os
+import sys
+import tempfile
+from openpyxl import load_workbook
+sys.path.append('.')
+
+from pre_processing_validator import PreProcessingValidator, _REPORT_COLUMNS
+
+def _make_summary(rows: int) -> dict:
+    """Validation summary with a mix of READY / ATTENTION / FAILED details"""
+    details = []
+    for i in range(rows):
+        details.append({
+            'filename': f"invoice_{i:04d}.pdf",
+            'status': ("✅ READY", "⚠️ ATTENTION", "❌ FAILED")[i % 3],
+            'entity_id': f"E{i}" if i % 3 != 2 else None,
+            'vendor_code': f"V{i}" if i % 3 == 0 else None,
+            'vendor_name': "Vodafone Limited" if i % 2 else "Vodafone PNG",
+            'currency': "GBP" if i % 2 else "PGK",
+            'detected_entity': f"Entity {i}",
+            'detected_vendor': "Vodafone",
+            'issues': [] if i % 3 == 0 else [f"Issue {i}a", f"Issue {i}b"]
+        })
+    return {'details': details}
+
+def _expected_row(detail: dict) -> tuple:
+    """Cell values the report should contain for one detail (blank cells read back as None)"""
+    return (
+        detail['filename'],
+        detail['status'],
+        detail['entity_id'],
+        detail['vendor_code'],
+        detail['vendor_name'],
+        detail['currency'],
+        detail['detected_entity'],
+        detail['detected_vendor'],
+        '; '.join(detail['issues']) if detail['issues'] else 'None'
+    )
+
+def test_detailed_report_has_every_cell():
+    """Every header and detail cell is present in the saved workbook"""
+    summary = _make_summary(250)
+    validator = PreProcessingValidator()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            validator._generate_detailed_report(summary)
+            reports = os.listdir('reports')
+            assert len(reports) == 1, reports
+
+            workbook = load_workbook(os.path.join('reports', reports[0]), read_only=True)
+            try:
+                sheet = workbook['Validation Results']
+                rows = list(sheet.iter_rows(values_only=True))
+            finally:
+                workbook.close()
+        finally:
+            os.chdir(cwd)
+
+    assert rows[0] == _REPORT_COLUMNS
+    assert len(rows) == len(summary['details']) + 1
+    for row, detail in zip(rows[1:], summary['details']):
+        assert row == _expected_row(detail), (row, detail)
+
+if __name__ == "__main__":
+    test_detailed_report_has_every_cell()
+    print("✅ Detailed report test passed")